@@ -1,10 +1,9 @@
 import time
-import matplotlib.pyplot as plt
-import numpy as np
 from graph import Graph
 import os
-import psutil
-from memory_profiler import profile
+
+# matplotlib, numpy, psutil et memory_profiler sont importés dans les méthodes
+# qui les utilisent : importer ce module ne coûte que l'import de Graph
 
 class BenchmarkAnalyzer:
     """Classe pour analyser et comparer les performances des algorithmes de recherche de chemin.
@@ -22,39 +21,77 @@ class BenchmarkAnalyzer:
         graph (Graph): Instance du graphe chargé
         generate_graphs (bool): Indique si les graphiques doivent être générés
         output_dir (str): Dossier de sortie pour les graphiques
+        largest_component_only (bool): Ne conserve que la plus grande composante connexe
+        simplify (bool): Contracte les chaînes de nœuds de degré 2 après le chargement
+        order (str): Ordre de numérotation des nœuds (voir graph.NODE_ORDERS)
+        profile_memory (bool): Affiche le profil mémoire ligne par ligne de
+            chaque exécution (memory_profiler) pendant run_comparison()
         
     Méthodes principales:
         load_graph(): Charge le graphe depuis les fichiers CSV
         run_comparison(): Compare les performances des algorithmes
         benchmark_load_csv_methods(): Compare les méthodes de chargement CSV
+        benchmark_node_orders(): Compare les ordres de numérotation des nœuds
+        benchmark_queues(): Compare les files de priorité des algorithmes
+        benchmark_weighted_a_star(): Compare A* pondéré pour plusieurs epsilon
+        benchmark_isochrones(): Mesure le débit des requêtes d'isochrones
+        benchmark_compression(): Compare le graphe compressé aux tableaux CSR
     """
 
-    def __init__(self, nodes_file, ways_file, graph_name="default", generate_graphs=True, output_dir="./benchmarks"):
+    def __init__(self, nodes_file, ways_file, graph_name="default", generate_graphs=True, output_dir="./benchmarks",
+                 largest_component_only=False, simplify=False, order="hilbert", profile_memory=True):
         self.nodes_file = nodes_file
         self.ways_file = ways_file
         self.graph_name = graph_name
         self.graph = None
         self.generate_graphs = generate_graphs
         self.output_dir = os.path.join(output_dir, graph_name)
+        self.largest_component_only = largest_component_only
+        self.simplify = simplify
+        self.order = order
+        self.profile_memory = profile_memory
         
         if generate_graphs:
             os.makedirs(self.output_dir, exist_ok=True)
         
-    def load_graph(self):
-        """Charge le graphe à partir des fichiers CSV"""
+    def load_graph(self, keep=()):
+        """Charge le graphe à partir des fichiers CSV
+        
+        Args:
+            keep (iterable): Nœuds à ne pas contracter lors de la simplification
+                (points de départ et d'arrivée des trajets)
+        """
         self.graph = Graph()
         start_time = time.time()
-        self.graph.load_from_csv(self.nodes_file, self.ways_file)
-        return time.time() - start_time
-        
-    @profile
-    def _run_algorithm(self, start_id, end_id, algorithm="dijkstra"):
+        self.graph.load_from_csv(self.nodes_file, self.ways_file,
+                                 largest_component_only=self.largest_component_only)
+        if self.simplify:
+            node_count = len(self.graph.nodes)
+            self.graph.simplify(keep=keep)
+            print(f"\n[INFO] ✂️  Simplification : {node_count} → {len(self.graph.nodes)} nœuds "
+                  f"(-{(1 - len(self.graph.nodes) / max(node_count, 1)) * 100:.1f}%)")
+        self.graph.build_arrays(self.order)
+        load_time = time.time() - start_time
+        self.print_components()
+        return load_time
+
+    def print_components(self):
+        """Affiche le nombre et la taille des composantes connexes du graphe."""
+        sizes = self.graph.component_sizes
+        print(f"\n[INFO] 🧩 Composantes connexes : {len(sizes)}")
+        if sizes:
+            print(f"[INFO] 🧩 Plus grande composante : {sizes[0]} nœuds "
+                  f"({sizes[0] / len(self.graph.nodes) * 100:.1f}%)")
+            print(f"[INFO] 🧩 Îlots de moins de 10 nœuds : {sum(1 for size in sizes if size < 10)}")
+        
+    def _run_algorithm(self, start_id, end_id, algorithm="dijkstra", queue="heapq"):
         """Exécute un algorithme de recherche de chemin et mesure ses performances.
         
         Args:
             start_id (str): Identifiant du point de départ
             end_id (str): Identifiant du point d'arrivée
             algorithm (str): Algorithme à utiliser ('dijkstra' ou 'a_star')
+            queue (str): File de priorité ('heapq', 'indexed' ou 'bucket')
             
         Returns:
             dict: Résultats des mesures de performance
@@ -64,9 +101,12 @@ class BenchmarkAnalyzer:
                     'memory': utilisation mémoire (MB),
                     'cpu': utilisation CPU (%),
                     'path_length': nombre de nœuds dans le chemin,
-                    'distance': distance totale (km)
+                    'distance': distance totale (km),
+                    'queue_stats': compteurs d'opérations de la file
                 }
         """
+        import psutil
+
         print(f"\n[INFO] 🚀 Démarrage de {algorithm.upper()}")
         print(f"[INFO] 📍 De: {start_id} → Vers: {end_id}")
         print("-"*40)
@@ -75,8 +115,8 @@ class BenchmarkAnalyzer:
         start_mem, start_cpu = process.memory_info().rss, process.cpu_percent()
         
         start_time = time.time()
-        distance, path = (self.graph.dijkstra(start_id, end_id) if algorithm == "dijkstra" 
-                         else self.graph.a_star(start_id, end_id))
+        distance, path = (self.graph.dijkstra(start_id, end_id, queue=queue) if algorithm == "dijkstra" 
+                         else self.graph.a_star(start_id, end_id, queue=queue))
         execution_time = time.time() - start_time
         
         end_mem, end_cpu = process.memory_info().rss, process.cpu_percent()
@@ -90,7 +130,8 @@ class BenchmarkAnalyzer:
             'memory': memory_usage,
             'cpu': cpu_usage,
             'path_length': len(path) if path else 0,
-            'distance': distance
+            'distance': distance,
+            'queue_stats': dict(self.graph.last_search_stats)
         }
 
     def run_comparison(self, start_id, end_id, path_name="default", num_runs=10):
@@ -108,6 +149,8 @@ class BenchmarkAnalyzer:
         Returns:
             dict: Résultats comparatifs des deux algorithmes
         """
+        import numpy as np
+
         self.path_name = path_name
         self.start_id = start_id
         self.end_id = end_id
@@ -120,13 +163,19 @@ class BenchmarkAnalyzer:
         self.results = {algo: {'times': [], 'memory': [], 'cpu': [], 'path_length': 0, 'distance': 0}
                        for algo in ['dijkstra', 'a_star']}
         
+        run_algorithm = self._run_algorithm
+        if self.profile_memory:
+            # Profil mémoire ligne par ligne, memory_profiler n'est importé qu'ici
+            from memory_profiler import profile
+            run_algorithm = profile(self._run_algorithm)
+        
         # Exécution multiple des algorithmes
         for i in range(num_runs):
             print(f"\n[INFO] 🔄 Exécution {i + 1}/{num_runs} pour le chemin {self.path_name}")
             print("-"*50)
             for algo in ['dijkstra', 'a_star']:
                 print(f"\n[INFO] ⚙️  Algorithme en cours : {algo.upper()}")
-                result = self._run_algorithm(start_id, end_id, algo)
+                result = run_algorithm(start_id, end_id, algo)
                 self.results[algo]['times'].append(result['time'])
                 self.results[algo]['memory'].append(result['memory'])
                 self.results[algo]['cpu'].append(result['cpu'])
@@ -155,6 +204,8 @@ class BenchmarkAnalyzer:
         - Utilisation mémoire
         - Utilisation CPU
         """
+        import matplotlib.pyplot as plt
+
         plt.style.use('default')
         colors = ['#2ecc71', '#e74c3c']
         plt.rcParams['axes.prop_cycle'] = plt.cycler(color=colors)
@@ -184,6 +235,8 @@ class BenchmarkAnalyzer:
         - Utilisation moyenne de la mémoire
         - Utilisation moyenne du CPU
         """
+        import matplotlib.pyplot as plt
+
         fig, axes = plt.subplots(1, 3, figsize=(15, 6))
         metrics = [('time', 'Temps moyen (s)'), ('memory', 'Mémoire moyenne (MB)'), ('cpu', 'CPU moyen (%)')]
         
@@ -235,58 +288,397 @@ class BenchmarkAnalyzer:
             print(f"⚡ CPU             : {results['avg_cpu']:.1f}%")
             print(f"📏 Distance totale : {results['distance']:.2f} km")
             print(f"🔢 Nœuds parcourus : {results['path_length']}")
+        
+        if self.graph is not None:
+            print(f"\n🧩 Composantes     : {len(self.graph.component_sizes)} "
+                  f"(plus grande : {self.graph.component_sizes[0] if self.graph.component_sizes else 0} nœuds)")
             
-    def benchmark_load_csv_methods(self):
-        """Compare les performances des différentes méthodes de chargement."""
-        from load_csv_methods import GraphCSV, GraphPandas, GraphPolars
+    def benchmark_node_orders(self, start_id, end_id, num_runs=10, orders=None):
+        """Mesure l'effet de la numérotation des nœuds sur le temps de recherche.
         
-        # Modification ici : on n'ajoute plus "loading_methods" au chemin
-        self.path_output_dir = self.output_dir
-        os.makedirs(self.path_output_dir, exist_ok=True)
+        Le graphe est renuméroté successivement dans chaque ordre puis
+        Dijkstra et A* sont exécutés sur le même trajet.
         
-        results = {}
-        methods = ['CSV Python', 'Pandas', 'Polars']
+        Args:
+            start_id (str): Identifiant du point de départ
+            end_id (str): Identifiant du point d'arrivée
+            num_runs (int): Nombre d'exécutions par ordre et par algorithme
+            orders (list): Ordres à comparer, tous ceux de NODE_ORDERS par défaut
+            
+        Returns:
+            dict: Temps moyens {ordre: {'build': s, 'dijkstra': s, 'a_star': s}}
+        """
+        from graph import NODE_ORDERS
+        import numpy as np
+        
+        if self.graph is None:
+            self.load_graph(keep=[start_id, end_id])
         
-        # Test de la méthode CSV Python
-        try:
+        results = {}
+        for order in orders or NODE_ORDERS:
             start_time = time.time()
-            graph_csv = GraphCSV()
-            graph_csv.load_from_csv(self.nodes_file, self.ways_file)
-            results['CSV Python'] = time.time() - start_time
-        except Exception as e:
-            print(f"Erreur avec CSV Python: {str(e)}")
-            results['CSV Python'] = None
+            self.graph.build_arrays(order)
+            results[order] = {'build': time.time() - start_time}
+            for algo in ['dijkstra', 'a_star']:
+                search = getattr(self.graph, algo)
+                times = []
+                for _ in range(num_runs):
+                    start_time = time.time()
+                    search(start_id, end_id)
+                    times.append(time.time() - start_time)
+                results[order][algo] = np.mean(times)
+            print(f"[INFO] 🗺️  Ordre {order:<8}: construction {results[order]['build']:.3f}s, "
+                  f"Dijkstra {results[order]['dijkstra']:.4f}s, A* {results[order]['a_star']:.4f}s")
+        
+        # Retour à l'ordre demandé pour les mesures suivantes
+        self.graph.build_arrays(self.order)
+        
+        if self.generate_graphs:
+            import matplotlib.pyplot as plt
             
-        # Test de la méthode Pandas
-        try:
-            start_time = time.time()
-            graph_pandas = GraphPandas()
-            graph_pandas.load_from_csv(self.nodes_file, self.ways_file)
-            results['Pandas'] = time.time() - start_time
-        except Exception as e:
-            print(f"Erreur avec Pandas: {str(e)}")
-            results['Pandas'] = None
+            labels = list(results)
+            x = np.arange(len(labels))
+            fig, ax = plt.subplots(figsize=(10, 6))
+            ax.bar(x - 0.2, [results[o]['dijkstra'] for o in labels], 0.4, label='Dijkstra', color='#2ecc71')
+            ax.bar(x + 0.2, [results[o]['a_star'] for o in labels], 0.4, label='A*', color='#e74c3c')
+            ax.set_xticks(x)
+            ax.set_xticklabels(labels)
+            ax.set_ylabel('Temps moyen (secondes)')
+            ax.set_title(f'Effet de la numérotation des nœuds - {self.graph_name}\n'
+                         f'De {start_id} vers {end_id} (moyenne sur {num_runs} exécutions)')
+            ax.legend()
+            plt.tight_layout()
+            plt.savefig(os.path.join(self.output_dir, f'{self.graph_name}_node_orders.png'))
+            plt.close()
+        
+        return results
+
+    def benchmark_queues(self, start_id, end_id, num_runs=10, queues=None):
+        """Compare les files de priorité utilisées par Dijkstra et A*.
+        
+        Args:
+            start_id (str): Identifiant du point de départ
+            end_id (str): Identifiant du point d'arrivée
+            num_runs (int): Nombre d'exécutions par file et par algorithme
+            queues (list): Files à comparer, toutes celles de QUEUES par défaut
+            
+        Returns:
+            dict: {(algorithme, file): {'avg_time', 'std_time', 'pushes', 'pops',
+                   'decreases', 'max_size', 'settled', 'distance'}}
+        """
+        from priority_queues import QUEUES
+        import numpy as np
+        
+        if self.graph is None:
+            self.load_graph(keep=[start_id, end_id])
+        
+        results = {}
+        for algo in ['dijkstra', 'a_star']:
+            search = getattr(self.graph, algo)
+            for queue in queues or QUEUES:
+                times = []
+                for _ in range(num_runs):
+                    start_time = time.time()
+                    distance, _ = search(start_id, end_id, queue=queue)
+                    times.append(time.time() - start_time)
+                stats = self.graph.last_search_stats
+                results[(algo, queue)] = {
+                    'avg_time': np.mean(times),
+                    'std_time': np.std(times),
+                    'pushes': stats['pushes'],
+                    'pops': stats['pops'],
+                    'decreases': stats['decreases'],
+                    'max_size': stats['max_size'],
+                    'settled': stats['settled'],
+                    'distance': distance
+                }
+        
+        print("\n" + "="*80)
+        print(f" 📊 FILES DE PRIORITÉ - {self.graph_name.upper()} - {start_id} → {end_id}")
+        print("="*80)
+        print(f"{'Algorithme':<10} {'File':<8} {'Temps (s)':>10} {'Insert.':>9} {'Extract.':>9} "
+              f"{'Dim. clé':>9} {'Taille max':>10} {'Traités':>9}")
+        for (algo, queue), r in results.items():
+            print(f"{algo:<10} {queue:<8} {r['avg_time']:>10.4f} {r['pushes']:>9} {r['pops']:>9} "
+                  f"{r['decreases']:>9} {r['max_size']:>10} {r['settled']:>9}")
+        
+        if self.generate_graphs:
+            import matplotlib.pyplot as plt
+            
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+            labels = [f"{'Dijkstra' if algo == 'dijkstra' else 'A*'}\n{queue}" for algo, queue in results]
+            ax1.bar(labels, [r['avg_time'] for r in results.values()],
+                    yerr=[r['std_time'] for r in results.values()], color='#3498db')
+            ax1.set_title(f'Temps moyen par file - {self.graph_name}')
+            ax1.set_ylabel('Temps (secondes)')
+            x = np.arange(len(labels))
+            ax2.bar(x - 0.2, [r['pushes'] for r in results.values()], 0.4, label='Insertions', color='#2ecc71')
+            ax2.bar(x + 0.2, [r['decreases'] for r in results.values()], 0.4, label='Diminutions de clé', color='#e74c3c')
+            ax2.set_xticks(x)
+            ax2.set_xticklabels(labels)
+            ax2.set_title('Opérations sur la file')
+            ax2.legend()
+            plt.tight_layout()
+            plt.savefig(os.path.join(self.output_dir, f'{self.graph_name}_from_{start_id}_to_{end_id}_queues.png'))
+            plt.close()
+        
+        return results
+
+    def benchmark_weighted_a_star(self, start_id, end_id, num_runs=10, epsilons=(0.0, 0.1, 0.25, 0.5, 1.0)):
+        """Compare A* pondéré pour plusieurs valeurs d'epsilon.
+        
+        Chaque valeur est comparée à la distance optimale (Dijkstra) : l'écart
+        mesuré reste inférieur à la borne garantie 1 + epsilon.
+        
+        Args:
+            start_id (str): Identifiant du point de départ
+            end_id (str): Identifiant du point d'arrivée
+            num_runs (int): Nombre d'exécutions par valeur d'epsilon
+            epsilons (tuple): Valeurs d'epsilon à comparer
             
-        # Test de la méthode Polars
-        try:
+        Returns:
+            dict: {epsilon: {'avg_time', 'settled', 'distance', 'stretch', 'bound'}}
+        """
+        import numpy as np
+
+        if self.graph is None:
+            self.load_graph(keep=[start_id, end_id])
+        
+        optimal, _ = self.graph.dijkstra(start_id, end_id)
+        results = {}
+        for epsilon in epsilons:
+            times = []
+            for _ in range(num_runs):
+                start_time = time.time()
+                distance, _ = self.graph.a_star(start_id, end_id, epsilon=epsilon)
+                times.append(time.time() - start_time)
+            stats = self.graph.last_search_stats
+            results[epsilon] = {
+                'avg_time': np.mean(times),
+                'settled': stats['settled'],
+                'distance': distance,
+                'stretch': distance / optimal if optimal > 0 else 1.0,
+                'bound': stats['bound']
+            }
+        
+        print("\n" + "="*80)
+        print(f" 📊 A* PONDÉRÉ - {self.graph_name.upper()} - {start_id} → {end_id}")
+        print(f" ⚖️  Facteur de calibration de l'heuristique : {self.graph.heuristic_scale:.6f}")
+        print("="*80)
+        print(f"{'Epsilon':>8} {'Temps (s)':>10} {'Traités':>9} {'Distance (km)':>14} {'Écart':>9} {'Borne':>7}")
+        for epsilon, r in results.items():
+            print(f"{epsilon:>8.2f} {r['avg_time']:>10.4f} {r['settled']:>9} {r['distance']:>14.3f} "
+                  f"{(r['stretch'] - 1) * 100:>8.2f}% {r['bound']:>7.2f}")
+        
+        if self.generate_graphs:
+            import matplotlib.pyplot as plt
+            
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+            labels = [f"ε = {epsilon:g}" for epsilon in results]
+            ax1.bar(labels, [r['settled'] for r in results.values()], color='#3498db')
+            ax1.set_title(f'Nœuds traités par A* pondéré - {self.graph_name}')
+            ax1.set_ylabel('Nœuds traités')
+            ax2.bar(labels, [(r['stretch'] - 1) * 100 for r in results.values()], color='#e67e22', label='Écart mesuré')
+            ax2.plot(labels, [epsilon * 100 for epsilon in results], 'k--', label='Borne garantie')
+            ax2.set_title("Écart à l'optimal (%)")
+            ax2.legend()
+            plt.tight_layout()
+            plt.savefig(os.path.join(self.output_dir, f'{self.graph_name}_from_{start_id}_to_{end_id}_weighted_a_star.png'))
+            plt.close()
+        
+        return results
+
+    def benchmark_isochrones(self, source_id, budgets=(1, 5, 10), num_runs=10, queue="heapq"):
+        """Mesure le temps et le débit des requêtes d'isochrones.
+        
+        Args:
+            source_id (str): Identifiant du nœud de départ
+            budgets (tuple): Budgets de distance en km, calculés en une seule passe
+            num_runs (int): Nombre de requêtes mesurées
+            queue (str): File de priorité (voir priority_queues.py)
+            
+        Returns:
+            dict: {'avg_time': s, 'requests_per_minute': n, 'reached': {budget: nœuds}}
+        """
+        import numpy as np
+
+        if self.graph is None:
+            self.load_graph(keep=[source_id])
+        
+        times = []
+        for _ in range(num_runs):
             start_time = time.time()
-            graph_polars = GraphPolars()
-            graph_polars.load_from_csv(self.nodes_file, self.ways_file)
-            results['Polars'] = time.time() - start_time
-        except Exception as e:
-            print(f"Erreur avec Polars: {str(e)}")
-            results['Polars'] = None
+            bands = self.graph.isochrones(source_id, budgets, queue=queue)
+            times.append(time.time() - start_time)
+        
+        avg_time = np.mean(times)
+        results = {
+            'avg_time': avg_time,
+            'requests_per_minute': 60 / avg_time if avg_time > 0 else float('inf'),
+            'reached': {budget: len(indices) for budget, (indices, _) in bands.items()}
+        }
+        
+        print(f"\n[INFO] 🎯 Isochrones depuis {source_id} ({', '.join(f'{b} km' for b in budgets)})")
+        print(f"⏱️  Temps moyen      : {avg_time:.4f} s (±{np.std(times):.4f})")
+        print(f"🚀 Débit           : {results['requests_per_minute']:.0f} requêtes/min")
+        for budget, reached in results['reached'].items():
+            print(f"📍 {budget:>6} km      : {reached} nœuds atteints")
+        return results
 
-        # Création des graphiques
+    def benchmark_compression(self, start_id, end_id, num_runs=10):
+        """Compare le graphe compressé (compressed_graph.py) aux tableaux CSR.
+        
+        Mesure la taille en mémoire et sur disque (instantané contre fichier
+        compressé), le temps d'ouverture, le décodage complet et le temps
+        d'une requête Dijkstra avec décodage des voisins à la demande.
+        
+        Args:
+            start_id (str): Identifiant du point de départ
+            end_id (str): Identifiant du point d'arrivée
+            num_runs (int): Nombre d'exécutions par mesure
+            
+        Returns:
+            dict: {'csr': {...}, 'compressed': {...}} avec 'memory_mb',
+                  'file_mb', 'open_time', 'query_time' et 'distance'
+        """
+        import tempfile
+        import numpy as np
+        from compressed_graph import CompressedGraph
+        
+        if self.graph is None:
+            self.load_graph(keep=[start_id, end_id])
+        graph = self.graph
+        compressed = CompressedGraph.from_graph(graph)
+        
+        def timed(function):
+            times = []
+            for _ in range(num_runs):
+                start_time = time.time()
+                value = function()
+                times.append(time.time() - start_time)
+            return np.mean(times), value
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot_path = os.path.join(tmp, "graph.snapshot")
+            compressed_path = os.path.join(tmp, "graph.compressed")
+            graph.save_snapshot(snapshot_path)
+            compressed.save(compressed_path)
+            snapshot_open, _ = timed(lambda: graph.load_snapshot(snapshot_path))
+            compressed_open, _ = timed(lambda: CompressedGraph.load(compressed_path))
+            file_sizes = (os.path.getsize(snapshot_path), os.path.getsize(compressed_path))
+        
+        csr_bytes = sum(a.itemsize * len(a) for a in (graph.adj_offsets, graph.adj_targets, graph.adj_weights,
+                                                         graph.lat, graph.lon, graph.components))
+        csr_query, (csr_distance, _) = timed(lambda: graph.dijkstra(start_id, end_id))
+        compressed_query, (compressed_distance, _) = timed(lambda: compressed.dijkstra(start_id, end_id))
+        decode_time, _ = timed(compressed.to_graph)
+        
+        results = {
+            'csr': {'memory_mb': csr_bytes / (1024 * 1024), 'file_mb': file_sizes[0] / (1024 * 1024),
+                    'open_time': snapshot_open, 'query_time': csr_query, 'distance': csr_distance},
+            'compressed': {'memory_mb': compressed.nbytes() / (1024 * 1024), 'file_mb': file_sizes[1] / (1024 * 1024),
+                           'open_time': compressed_open, 'query_time': compressed_query,
+                           'distance': compressed_distance, 'decode_time': decode_time},
+        }
+        
+        print("\n" + "="*80)
+        print(f" 🗜️  GRAPHE COMPRESSÉ - {self.graph_name.upper()} - {start_id} → {end_id}")
+        print("="*80)
+        print(f"{'Format':<12} {'Mémoire (MB)':>13} {'Fichier (MB)':>13} {'Ouverture (s)':>14} "
+              f"{'Requête (s)':>12} {'Distance (km)':>14}")
+        for name, r in results.items():
+            print(f"{name:<12} {r['memory_mb']:>13.2f} {r['file_mb']:>13.2f} {r['open_time']:>14.4f} "
+                  f"{r['query_time']:>12.4f} {r['distance']:>14.3f}")
+        print(f"📦 Gain mémoire    : {results['csr']['memory_mb'] / results['compressed']['memory_mb']:.2f}x, "
+              f"décodage complet en {decode_time:.4f} s")
+        
         if self.generate_graphs:
+            import matplotlib.pyplot as plt
+            
             fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+            labels = ['Mémoire', 'Fichier']
+            x = np.arange(len(labels))
+            ax1.bar(x - 0.2, [results['csr']['memory_mb'], results['csr']['file_mb']], 0.4, label='CSR', color='#3498db')
+            ax1.bar(x + 0.2, [results['compressed']['memory_mb'], results['compressed']['file_mb']], 0.4,
+                    label='Compressé', color='#2ecc71')
+            ax1.set_xticks(x)
+            ax1.set_xticklabels(labels)
+            ax1.set_title(f'Taille du graphe (MB) - {self.graph_name}')
+            ax1.legend()
+            ax2.bar(['Ouverture\nCSR', 'Ouverture\ncompressé', 'Requête\nCSR', 'Requête\ncompressé', 'Décodage\ncomplet'],
+                    [snapshot_open, compressed_open, csr_query, compressed_query, decode_time],
+                    color=['#3498db', '#2ecc71', '#3498db', '#2ecc71', '#e67e22'])
+            ax2.set_title('Temps (secondes)')
+            plt.tight_layout()
+            plt.savefig(os.path.join(self.output_dir, f'{self.graph_name}_from_{start_id}_to_{end_id}_compression.png'))
+            plt.close()
+        
+        return results
+
+    def benchmark_load_csv_methods(self):
+        """Compare les performances des différentes méthodes de chargement.
+        
+        Chaque méthode est exécutée dans un processus dédié afin de mesurer
+        son pic de mémoire résidente (RSS) indépendamment des autres.
+        Les pics mesurés (mémoire ajoutée par le chargement) sont conservés
+        dans self.load_peak_rss (MB).
+        
+        Si des fichiers Parquet (osm2csv --format parquet) existent à côté des
+        CSV, les méthodes Parquet sont mesurées aussi et les tailles des
+        fichiers sont comparées (self.file_sizes, en MB).
+        
+        Returns:
+            dict: Temps de chargement par méthode {nom: secondes}
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+        from load_csv_methods import LOAD_METHODS, PARQUET_LOAD_METHODS
+        
+        # Modification ici : on n'ajoute plus "loading_methods" au chemin
+        self.path_output_dir = self.output_dir
+        os.makedirs(self.path_output_dir, exist_ok=True)
+        
+        results = {}
+        self.load_peak_rss = {}
+        
+        # Fichiers Parquet éventuels, à côté des fichiers CSV
+        nodes_parquet = os.path.splitext(self.nodes_file)[0] + ".parquet"
+        ways_parquet = os.path.splitext(self.ways_file)[0] + ".parquet"
+        runs = [(method, self.nodes_file, self.ways_file) for method in LOAD_METHODS]
+        self.file_sizes = {'CSV': (os.path.getsize(self.nodes_file) + os.path.getsize(self.ways_file)) / (1024 * 1024)}
+        if os.path.exists(nodes_parquet) and os.path.exists(ways_parquet):
+            runs += [(method, nodes_parquet, ways_parquet) for method in PARQUET_LOAD_METHODS]
+            self.file_sizes['Parquet'] = (os.path.getsize(nodes_parquet) + os.path.getsize(ways_parquet)) / (1024 * 1024)
+        for file_format, size in self.file_sizes.items():
+            print(f"[INFO] 💽 Taille des fichiers {file_format:<8}: {size:.1f} MB")
+        
+        for method, nodes_file, ways_file in runs:
+            try:
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                    load_time, peak_rss = executor.submit(_measure_load, method, nodes_file, ways_file).result()
+                results[method] = load_time
+                self.load_peak_rss[method] = peak_rss
+                print(f"[INFO] 📥 {method:<22}: {load_time:.3f} s, pic mémoire {peak_rss:.1f} MB")
+            except Exception as e:
+                print(f"Erreur avec {method}: {str(e)}")
+                results[method] = None
+                self.load_peak_rss[method] = None
+
+        # Création des graphiques
+        if self.generate_graphs:
+            import matplotlib.pyplot as plt
+            
+            fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(24, 6))
+            colors = ['#2ecc71', '#e74c3c', '#3498db', '#9b59b6', '#e67e22', '#1abc9c', '#34495e']
             
             methods = list(results.keys())
             times = list(results.values())
             
             # Premier graphique
-            ax1.bar(methods, times, color=['#2ecc71', '#e74c3c', '#3498db'])
-            ax1.set_title(f'Temps de chargement - {self.graph_name}')
+            ax1.bar(methods, [t or 0 for t in times], color=colors)
+            ax1.set_title(f'Temps de chargement - {self.graph_name}\n'
+                          + ', '.join(f'{fmt} : {size:.1f} MB' for fmt, size in self.file_sizes.items()))
+            ax1.tick_params(axis='x', labelrotation=20)
             ax1.set_ylabel('Temps (secondes)')
             
             # Calcul et affichage des pourcentages
@@ -299,7 +691,7 @@ class BenchmarkAnalyzer:
             
             # Deuxième graphique - Comparaison relative
             relative_times = [t/min_time if t is not None else 0 for t in times]
-            ax2.bar(methods, relative_times, color=['#2ecc71', '#e74c3c', '#3498db'])
+            ax2.bar(methods, relative_times, color=colors)
             ax2.set_title('Comparaison relative')
             ax2.set_ylabel('Ratio (1 = plus rapide)')
             
@@ -307,12 +699,66 @@ class BenchmarkAnalyzer:
                 if v > 0:
                     ax2.text(i, v, f'{v:.2f}x', ha='center', va='bottom')
             
+            # Troisième graphique - Pic de mémoire
+            peaks = [self.load_peak_rss[method] or 0 for method in methods]
+            ax3.bar(methods, peaks, color=colors)
+            ax3.set_title('Pic de mémoire ajoutée par le chargement')
+            ax3.set_ylabel('Mémoire (MB)')
+            for i, v in enumerate(peaks):
+                if v > 0:
+                    ax3.text(i, v, f'{v:.0f} MB', ha='center', va='bottom')
+            
             plt.tight_layout()
             plt.savefig(os.path.join(self.path_output_dir, f'{self.graph_name}_load_csv_methods_comparison.png'))
             plt.close()
         
         return results
 
+def _measure_load(method, nodes_file, ways_file, interval=0.005):
+    """Charge un graphe avec une méthode donnée et mesure le temps et le pic mémoire.
+    
+    Exécutée dans un processus séparé par benchmark_load_csv_methods().
+    La mémoire résidente est échantillonnée pendant le chargement ; le pic
+    est compté au-dessus de la mémoire du processus avant le chargement
+    (modules déjà importés).
+    
+    Args:
+        method (str): Nom de la méthode dans LOAD_METHODS ou PARQUET_LOAD_METHODS
+        nodes_file (str): Chemin vers le fichier des nœuds
+        ways_file (str): Chemin vers le fichier des routes
+        interval (float): Période d'échantillonnage de la mémoire (s)
+        
+    Returns:
+        tuple: (temps de chargement en s, pic de mémoire ajoutée en MB)
+    """
+    import threading
+    from load_csv_methods import LOAD_METHODS, PARQUET_LOAD_METHODS
+    import psutil
+    # Bibliothèques des méthodes importées avant la mesure de référence :
+    # seul le chargement lui-même est compté dans le pic mémoire
+    import pandas
+    import polars
+    
+    process = psutil.Process(os.getpid())
+    baseline = process.memory_info().rss
+    peak = [baseline]
+    done = threading.Event()
+    
+    def sample():
+        while not done.wait(interval):
+            peak[0] = max(peak[0], process.memory_info().rss)
+    
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start_time = time.time()
+    graph = {**LOAD_METHODS, **PARQUET_LOAD_METHODS}[method]()
+    graph.load_from_csv(nodes_file, ways_file)
+    load_time = time.time() - start_time
+    peak[0] = max(peak[0], process.memory_info().rss)
+    done.set()
+    sampler.join()
+    return load_time, (peak[0] - baseline) / (1024 * 1024)
+
 def main():
     """
     
@@ -1,24 +1,34 @@
+import argparse
 from benchmark import BenchmarkAnalyzer
 from graph_data import GRAPH_DATA
 
-def run_benchmarks(generate_graphs=True):
+# Analyses complémentaires de BenchmarkAnalyzer, exécutées par run_analyses
+ANALYSES = ("queues", "weighted-a-star", "isochrones", "compression")
+BENCHMARKS = ("paths", "node-orders") + ANALYSES
+
+def run_benchmarks(generate_graphs=True, simplify=False, graph_name=None):
     """
     Exécute les benchmarks pour tous les jeux de données définis dans GRAPH_DATA
     
     Args:
         generate_graphs (bool): Indique si les graphiques doivent être générés
+        simplify (bool): Contracte les chaînes de nœuds de degré 2 avant les mesures
+        graph_name (str): Nom du jeu de données à utiliser, tous par défaut
     """
     print("\nDémarrage des benchmarks...")
     
     for data in GRAPH_DATA:
+        if graph_name is not None and data['name'] != graph_name:
+            continue
         print(f"\nAnalyse du graphe : {data['name']}")
         analyzer = BenchmarkAnalyzer(
             data['nodes'], 
             data['ways'],
             graph_name=data['name'],
-            generate_graphs=generate_graphs
+            generate_graphs=generate_graphs,
+            simplify=simplify
         )
-        analyzer.load_graph()
+        analyzer.load_graph(keep=[data['points']['start']] + data['points']['end'])
         
         for end_point in data['points']['end']:
             path_name = f"from_{data['points']['start']}_to_{end_point}"
@@ -31,13 +41,87 @@ def run_benchmarks(generate_graphs=True):
             )
             analyzer.print_results()
 
+def run_node_order_benchmarks(generate_graphs=True, graph_name="Ariège"):
+    """
+    Compare les ordres de numérotation des nœuds (localité mémoire) sur un jeu de données
+    
+    Args:
+        generate_graphs (bool): Indique si les graphiques doivent être générés
+        graph_name (str): Nom du jeu de données de GRAPH_DATA à utiliser
+    """
+    data = next(data for data in GRAPH_DATA if data['name'] == graph_name)
+    print(f"\nNumérotation des nœuds : {data['name']}")
+    analyzer = BenchmarkAnalyzer(
+        data['nodes'],
+        data['ways'],
+        graph_name=data['name'],
+        generate_graphs=generate_graphs
+    )
+    analyzer.load_graph(keep=[data['points']['start']] + data['points']['end'])
+    for end_point in data['points']['end']:
+        analyzer.benchmark_node_orders(data['points']['start'], end_point)
+
+def run_analyses(analyses, generate_graphs=True, simplify=False, graph_name=None):
+    """
+    Exécute les analyses complémentaires (files de priorité, A* pondéré,
+    isochrones, graphe compressé) pour les jeux de données de GRAPH_DATA
+    
+    Args:
+        analyses (list): Analyses à exécuter, parmi ANALYSES
+        generate_graphs (bool): Indique si les graphiques doivent être générés
+        simplify (bool): Contracte les chaînes de nœuds de degré 2 avant les mesures
+        graph_name (str): Nom du jeu de données à utiliser, tous par défaut
+    """
+    for data in GRAPH_DATA:
+        if graph_name is not None and data['name'] != graph_name:
+            continue
+        print(f"\nAnalyses complémentaires : {data['name']}")
+        analyzer = BenchmarkAnalyzer(
+            data['nodes'],
+            data['ways'],
+            graph_name=data['name'],
+            generate_graphs=generate_graphs,
+            simplify=simplify
+        )
+        start_point = data['points']['start']
+        analyzer.load_graph(keep=[start_point] + data['points']['end'])
+        
+        if "isochrones" in analyses:
+            analyzer.benchmark_isochrones(start_point)
+        for end_point in data['points']['end']:
+            if "queues" in analyses:
+                analyzer.benchmark_queues(start_point, end_point)
+            if "weighted-a-star" in analyses:
+                analyzer.benchmark_weighted_a_star(start_point, end_point)
+            if "compression" in analyses:
+                analyzer.benchmark_compression(start_point, end_point)
+
 def main():
     """Point d'entrée principal"""
-    # Exécution des benchmarks avec génération des graphiques
-    run_benchmarks(generate_graphs=True)
+    parser = argparse.ArgumentParser(description="Benchmarks des recherches de chemins.")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS + ("all",), default=["paths"],
+                        help="Benchmarks à exécuter (paths par défaut, all pour tous).")
+    parser.add_argument("--graph", default=None,
+                        help="Jeu de données de GRAPH_DATA à utiliser (tous par défaut, Ariège pour node-orders).")
+    parser.add_argument("--simplify", action="store_true",
+                        help="Contracte les chaînes de nœuds de degré 2 avant les mesures.")
+    parser.add_argument("--no-graphs", action="store_true", help="Ne génère pas les graphiques.")
+    args = parser.parse_args()
+    
+    selected = BENCHMARKS if "all" in args.benchmarks else args.benchmarks
+    generate_graphs = not args.no_graphs
+    
+    if "paths" in selected:
+        run_benchmarks(generate_graphs=generate_graphs, simplify=args.simplify, graph_name=args.graph)
+    if "node-orders" in selected:
+        run_node_order_benchmarks(generate_graphs=generate_graphs, graph_name=args.graph or "Ariège")
+    analyses = [analysis for analysis in ANALYSES if analysis in selected]
+    if analyses:
+        run_analyses(analyses, generate_graphs=generate_graphs, simplify=args.simplify, graph_name=args.graph)
     
     print("\nBenchmarks terminés !")
-    print("Les graphiques ont été générés dans le dossier courant.")
+    if generate_graphs:
+        print("Les graphiques ont été générés dans le dossier courant.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
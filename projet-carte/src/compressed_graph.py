@@ -0,0 +1,307 @@
+"""
+Encodage compact d'un graphe routier.
+
+Après la renumérotation par localité de Graph.build_arrays(), les voisins
+d'un nœud ont des indices proches du sien : les listes de voisins sont
+codées par différences successives en entiers de longueur variable
+(varint, 7 bits par octet), et les longueurs d'arêtes sont arrondies au
+mètre supérieur : elles ne sont jamais inférieures aux longueurs réelles,
+ce qui garde admissible l'heuristique calibrée du graphe d'origine,
+conservée avec l'encodage. Chaque nœud occupe un enregistrement d'octets :
+
+    degré, écart du 1er voisin (zigzag, relatif au nœud), écarts suivants,
+    longueurs des arêtes en mètres
+
+Les enregistrements se décodent à la demande pendant une recherche
+(CompressedGraph.dijkstra) ou en une fois vers un Graph (to_graph).
+
+Seul le graphe routable est conservé : noms des nœuds et géométrie des
+arêtes contractées par Graph.simplify() ne sont pas encodés.
+"""
+
+import math
+from array import array
+from heapq import heappush, heappop
+
+# Version du format des fichiers écrits par CompressedGraph.save
+COMPRESSED_VERSION = 2
+
+# Précision des coordonnées stockées (1e-7 degré, environ 1 cm)
+COORDINATE_SCALE = 10_000_000
+
+
+def _append_varint(buffer, value):
+    """Ajoute un entier positif codé en varint à un bytearray."""
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+class CompressedGraph:
+    """Graphe encodé en listes de voisins différentielles (varint).
+
+    Attributs:
+        node_ids (array): Identifiants OSM des nœuds, par indice (int64)
+        lat, lon (array): Coordonnées par indice en 1e-7 degré (int32),
+            inversées comme dans Graph (lat contient la longitude)
+        components (array): Composante connexe de chaque indice
+        offsets (array): Position de l'enregistrement de chaque nœud dans data
+        data (bytes): Enregistrements des nœuds, concaténés
+        order (str): Ordre de numérotation du graphe d'origine
+        heuristic_scale (float): Facteur de calibration de A* du graphe d'origine
+    """
+
+    def __init__(self, node_ids, lat, lon, components, offsets, data, order, heuristic_scale):
+        self.node_ids = node_ids
+        self.lat = lat
+        self.lon = lon
+        self.components = components
+        self.offsets = offsets
+        self.data = data
+        self.order = order
+        self.heuristic_scale = heuristic_scale
+        self.node_index = {str(node_id): i for i, node_id in enumerate(node_ids)}
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Encode un graphe à partir de ses tableaux CSR.
+
+        Args:
+            graph (Graph): Graphe chargé (build_arrays() est appelé si besoin)
+
+        Returns:
+            CompressedGraph: Graphe encodé
+        """
+        graph._ensure_arrays()
+        offsets, targets, weights = graph.adj_offsets, graph.adj_targets, graph.adj_weights
+        data = bytearray()
+        positions = array('I')
+        for i in range(len(graph.node_ids)):
+            positions.append(len(data))
+            start, end = offsets[i], offsets[i + 1]
+            _append_varint(data, end - start)
+            previous = i
+            for k in range(start, end):
+                # Le premier écart peut être négatif : codage zigzag
+                delta = targets[k] - previous
+                _append_varint(data, (delta << 1) ^ (delta >> 63) if k == start else delta)
+                previous = targets[k]
+            for k in range(start, end):
+                _append_varint(data, math.ceil(weights[k] * 1000))
+        positions.append(len(data))
+
+        try:
+            node_ids = array('q', (int(node_id) for node_id in graph.node_ids))
+        except ValueError:
+            raise ValueError("Les identifiants des nœuds doivent être numériques (identifiants OSM)")
+        lat = array('i', (round(value * COORDINATE_SCALE) for value in graph.lat))
+        lon = array('i', (round(value * COORDINATE_SCALE) for value in graph.lon))
+        return cls(node_ids, lat, lon, array('i', graph.components), positions, bytes(data), graph.order,
+                   graph.heuristic_scale)
+
+    def neighbors(self, i):
+        """Décode la liste des voisins d'un nœud.
+
+        Args:
+            i (int): Indice du nœud
+
+        Returns:
+            list: [(indice du voisin, longueur en mètres)]
+        """
+        data = self.data
+        position = self.offsets[i]
+        values = []
+        # Degré puis 2 * degré entiers : décodage varint en ligne
+        count = 1
+        while count:
+            value = shift = 0
+            while True:
+                byte = data[position]
+                position += 1
+                value |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            if not values:
+                count = 2 * value + 1
+            values.append(value)
+            count -= 1
+        degree = values[0]
+        result = []
+        target = i
+        for j in range(degree):
+            delta = values[1 + j]
+            target += (delta >> 1) ^ -(delta & 1) if j == 0 else delta
+            result.append((target, values[1 + degree + j]))
+        return result
+
+    def dijkstra(self, start_id, end_id):
+        """Plus court chemin en décodant les voisins à la demande.
+
+        Les distances sont additionnées en mètres entiers, puis converties
+        en km : elles dépassent celles de Graph.dijkstra de moins d'un mètre
+        par arête du chemin (arrondi au mètre supérieur des longueurs).
+
+        Args:
+            start_id (str): Identifiant du nœud de départ
+            end_id (str): Identifiant du nœud d'arrivée
+
+        Returns:
+            tuple: (distance totale en km, liste des identifiants des nœuds du chemin)
+        """
+        start, end = self.node_index.get(str(start_id)), self.node_index.get(str(end_id))
+        if start is None or end is None or self.components[start] != self.components[end]:
+            return float('inf'), []
+
+        neighbors = self.neighbors
+        distances = {start: 0}
+        predecessors = {start: -1}
+        heap = [(0, start)]
+        while heap:
+            dist, current = heappop(heap)
+            if dist > distances[current]:
+                continue
+            if current == end:
+                break
+            for neighbor, length in neighbors(current):
+                new_dist = dist + length
+                if neighbor not in distances or new_dist < distances[neighbor]:
+                    distances[neighbor] = new_dist
+                    predecessors[neighbor] = current
+                    heappush(heap, (new_dist, neighbor))
+        if end not in distances:
+            return float('inf'), []
+
+        path = []
+        current = end
+        while current != -1:
+            path.append(str(self.node_ids[current]))
+            current = predecessors[current]
+        return distances[end] / 1000, path[::-1]
+
+    def decode_arrays(self):
+        """Décode tous les enregistrements en tableaux CSR (vectorisé avec numpy).
+
+        Returns:
+            tuple: (adj_offsets, adj_targets, adj_weights en km) au format de Graph
+        """
+        import numpy as np
+
+        raw = np.frombuffer(self.data, dtype=np.uint8)
+        n = len(self.node_ids)
+        if n == 0:
+            return array('l', [0]), array('l'), array('d')
+
+        # Découpage du flux en varints : chacun se termine par un octet < 0x80
+        ends = np.flatnonzero(raw < 0x80)
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        shifts = 7 * (np.arange(len(raw)) - np.repeat(starts, ends - starts + 1))
+        values = np.add.reduceat((raw & 0x7f).astype(np.int64) << shifts, starts)
+
+        # Position du degré de chaque nœud dans la suite des varints
+        # La taille des éléments de array('I') dépend de la plateforme
+        positions = np.frombuffer(self.offsets, dtype=np.dtype(f"u{self.offsets.itemsize}"))
+        records = np.searchsorted(starts, positions[:-1].astype(np.int64))
+        degrees = values[records]
+        adj_offsets = np.concatenate(([0], np.cumsum(degrees)))
+        edge_count = int(adj_offsets[-1])
+        rank = np.arange(edge_count) - np.repeat(adj_offsets[:-1], degrees)
+        first = np.repeat(records, degrees) + 1
+        deltas = values[first + rank]
+        weights = values[first + np.repeat(degrees, degrees) + rank]
+
+        # Premier écart en zigzag, relatif au nœud ; les suivants s'additionnent
+        heads = adj_offsets[:-1][degrees > 0]
+        deltas[heads] = (deltas[heads] >> 1) ^ -(deltas[heads] & 1)
+        deltas[heads] += np.flatnonzero(degrees > 0)
+        sums = np.cumsum(deltas)
+        segment_start = np.repeat(sums[heads] - deltas[heads], degrees[degrees > 0])
+        targets = sums - segment_start
+
+        # array('l') fait 4 octets sur certaines plateformes (Windows) : pas de
+        # copie brute des int64, conversion élément par élément
+        return (array('l', adj_offsets.tolist()),
+                array('l', targets.tolist()),
+                array('d', (weights / 1000).astype(np.float64).tobytes()))
+
+    def to_graph(self):
+        """Décode le graphe complet en un Graph prêt pour les recherches.
+
+        Returns:
+            Graph: Graphe équivalent (longueurs arrondies au mètre supérieur, sans noms)
+        """
+        from graph import Graph, Node
+
+        offsets, targets, weights = self.decode_arrays()
+        graph = Graph()
+        node_ids = [str(node_id) for node_id in self.node_ids]
+        lat = array('d', (value / COORDINATE_SCALE for value in self.lat))
+        lon = array('d', (value / COORDINATE_SCALE for value in self.lon))
+        for i, node_id in enumerate(node_ids):
+            # Node inverse lat/lon à la construction
+            node = Node(node_id, lon[i], lat[i], "")
+            node.neighbors = {node_ids[targets[k]]: weights[k] for k in range(offsets[i], offsets[i + 1])}
+            graph.nodes[node_id] = node
+
+        graph.order = self.order
+        graph.node_ids = node_ids
+        graph.node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        graph.lat, graph.lon = lat, lon
+        graph.adj_offsets, graph.adj_targets, graph.adj_weights = offsets, targets, weights
+        graph.components = array('i', self.components)
+        sizes = {}
+        for label in self.components:
+            sizes[label] = sizes.get(label, 0) + 1
+        graph.component_sizes = [sizes[label] for label in sorted(sizes)]
+        # Les longueurs arrondies par excès gardent l'heuristique d'origine admissible
+        graph.heuristic_scale = self.heuristic_scale
+        return graph
+
+    def nbytes(self):
+        """Taille des données encodées en mémoire (octets)."""
+        return (len(self.data) + sum(a.itemsize * len(a) for a in
+                (self.node_ids, self.lat, self.lon, self.components, self.offsets)))
+
+    def save(self, path):
+        """Enregistre le graphe encodé dans un fichier binaire.
+
+        Args:
+            path (str): Chemin du fichier
+        """
+        import pickle
+
+        with open(path, "wb") as f:
+            pickle.dump({
+                "version": COMPRESSED_VERSION,
+                "order": self.order,
+                "node_ids": self.node_ids,
+                "lat": self.lat,
+                "lon": self.lon,
+                "components": self.components,
+                "offsets": self.offsets,
+                "data": self.data,
+                "heuristic_scale": self.heuristic_scale,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Charge un graphe encodé écrit par save().
+
+        Args:
+            path (str): Chemin du fichier
+
+        Returns:
+            CompressedGraph: Graphe encodé, décodé à la demande
+        """
+        import pickle
+
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        if saved.get("version") != COMPRESSED_VERSION:
+            raise ValueError(f"Version de graphe compressé non supportée : {saved.get('version')}")
+        return cls(saved["node_ids"], saved["lat"], saved["lon"], saved["components"],
+                   saved["offsets"], saved["data"], saved["order"], saved["heuristic_scale"])
@@ -0,0 +1,245 @@
+"""
+Vérification croisée des moteurs de plus court chemin.
+
+Des couples (départ, arrivée) tirés au hasard sont calculés par chaque
+moteur de ENGINES et comparés à la référence Graph.dijkstra (file heapq).
+Les écarts de distance au-delà de la tolérance sont signalés avec les deux
+chemins concernés. Pour A* pondéré, la distance peut dépasser l'optimale
+dans la limite de la borne garantie (PathResult.bound). Le moteur
+"compressed" (CompressedGraph.dijkstra) arrondit les longueurs au mètre
+supérieur : sa distance peut dépasser la référence de moins de
+COMPRESSED_EDGE_TOLERANCE par arête du chemin.
+
+Les requêtes sont réparties sur plusieurs processus : chaque processus
+ouvre un instantané du graphe (Graph.load_snapshot) puis traite ses
+couples, ce qui permet de vérifier des milliers de couples.
+
+Utilisation :
+    python cross_check.py nodes.csv ways.csv --pairs 2000 --workers 8
+    python cross_check.py --snapshot graph.snapshot --engines a_star dijkstra-bucket
+"""
+
+import argparse
+import json
+import math
+import os
+import tempfile
+import time
+
+from graph import Graph
+
+REFERENCE = "dijkstra"
+
+# Écart toléré par arête pour le graphe compressé (longueurs arrondies au mètre supérieur, km)
+COMPRESSED_EDGE_TOLERANCE = 0.001
+
+# Moteurs comparés : {nom: (algorithme de Graph.shortest_path, file de priorité, epsilon)}
+# L'algorithme "compressed" désigne CompressedGraph.dijkstra
+ENGINES = {
+    "dijkstra": ("dijkstra", "heapq", 0.0),
+    "dijkstra-indexed": ("dijkstra", "indexed", 0.0),
+    "dijkstra-bucket": ("dijkstra", "bucket", 0.0),
+    "a_star": ("a_star", "heapq", 0.0),
+    "a_star-indexed": ("a_star", "indexed", 0.0),
+    "a_star-bucket": ("a_star", "bucket", 0.0),
+    "a_star-eps0.25": ("a_star", "heapq", 0.25),
+    "compressed": ("compressed", "heapq", 0.0),
+}
+
+_graph = None  # Graphe ouvert par chaque processus de travail
+_compressed = None  # (graphe, CompressedGraph), encodé à la première requête
+
+
+def _open_snapshot(path):
+    global _graph
+    _graph = Graph.load_snapshot(path)
+
+
+def run_engine(graph, engine, start_id, end_id):
+    """Calcule un chemin avec un moteur de ENGINES.
+
+    Returns:
+        tuple: (distance en km, liste des identifiants du chemin, borne de sous-optimalité)
+    """
+    global _compressed
+    algorithm, queue, epsilon = ENGINES[engine]
+    if algorithm == "compressed":
+        from compressed_graph import CompressedGraph
+
+        if _compressed is None or _compressed[0] is not graph:
+            _compressed = (graph, CompressedGraph.from_graph(graph))
+        distance, node_ids = _compressed[1].dijkstra(start_id, end_id)
+        return distance, node_ids, 1.0
+    result = graph.shortest_path(start_id, end_id, algorithm=algorithm, queue=queue, epsilon=epsilon)
+    return result.distance, result.node_ids, result.bound
+
+
+def check_pairs(pairs, engines, rel_tol=1e-9, abs_tol=1e-9, graph=None):
+    """Compare les moteurs à la référence sur une liste de couples.
+
+    Args:
+        pairs (list): Couples (départ, arrivée)
+        engines (list): Noms des moteurs comparés à REFERENCE
+        rel_tol (float): Écart relatif toléré sur la distance
+        abs_tol (float): Écart absolu toléré sur la distance (km)
+        graph (Graph): Graphe utilisé (par défaut, celui du processus de travail)
+
+    Returns:
+        tuple: (nombre de comparaisons par moteur, écart relatif maximal
+            par moteur, liste des désaccords)
+    """
+    graph = graph if graph is not None else _graph
+    checked = {engine: 0 for engine in engines}
+    max_error = {engine: 0.0 for engine in engines}
+    mismatches = []
+    for start_id, end_id in pairs:
+        expected, expected_path, _ = run_engine(graph, REFERENCE, start_id, end_id)
+        for engine in engines:
+            distance, path, bound = run_engine(graph, engine, start_id, end_id)
+            checked[engine] += 1
+            if expected == distance:
+                continue
+            if math.isinf(expected) or math.isinf(distance):
+                error = float('inf')
+            else:
+                error = abs(distance - expected) / expected if expected > 0 else abs(distance)
+            max_error[engine] = max(max_error[engine], error)
+            # Un moteur à borne garantie peut rendre jusqu'à bound fois l'optimal
+            accepted = bound > 1.0 and expected <= distance <= expected * bound
+            if ENGINES[engine][0] == "compressed" and not math.isinf(expected):
+                # Longueurs arrondies par excès : moins d'un mètre de plus par arête
+                slack = COMPRESSED_EDGE_TOLERANCE * (len(expected_path) - 1)
+                accepted = expected - abs_tol <= distance <= expected + slack
+            if not accepted and not math.isclose(distance, expected, rel_tol=rel_tol, abs_tol=abs_tol):
+                mismatches.append({
+                    'engine': engine,
+                    'start': start_id,
+                    'end': end_id,
+                    'expected': expected,
+                    'distance': distance,
+                    'relative_error': error,
+                    'expected_path': expected_path,
+                    'path': path,
+                })
+    return checked, max_error, mismatches
+
+
+def _divergence(path1, path2):
+    """Renvoie l'indice du premier nœud où deux chemins diffèrent."""
+    for i, (a, b) in enumerate(zip(path1, path2)):
+        if a != b:
+            return i
+    return min(len(path1), len(path2))
+
+
+def cross_check(graph, pairs, engines=None, rel_tol=1e-9, abs_tol=1e-9, workers=None, chunk_size=50):
+    """Vérifie en parallèle que chaque moteur retrouve les distances de la référence.
+
+    Args:
+        graph (Graph): Graphe chargé
+        pairs (list): Couples (départ, arrivée) à vérifier
+        engines (list): Moteurs comparés (tous ceux de ENGINES par défaut)
+        rel_tol (float): Écart relatif toléré sur la distance
+        abs_tol (float): Écart absolu toléré sur la distance (km)
+        workers (int): Nombre de processus (tous les cœurs par défaut, 1 = sans processus)
+        chunk_size (int): Nombre de couples par tâche
+
+    Returns:
+        dict: {'checked', 'max_error', 'mismatches'} agrégés sur tous les couples
+    """
+    engines = [engine for engine in (engines or ENGINES) if engine != REFERENCE]
+    checked = {engine: 0 for engine in engines}
+    max_error = {engine: 0.0 for engine in engines}
+    mismatches = []
+
+    def merge(result):
+        chunk_checked, chunk_error, chunk_mismatches = result
+        for engine in engines:
+            checked[engine] += chunk_checked[engine]
+            max_error[engine] = max(max_error[engine], chunk_error[engine])
+        mismatches.extend(chunk_mismatches)
+
+    if workers == 1:
+        merge(check_pairs(pairs, engines, rel_tol, abs_tol, graph))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        with tempfile.TemporaryDirectory() as tmp:
+            # Les processus ouvrent un instantané plutôt que de relire les CSV
+            snapshot = os.path.join(tmp, "graph.snapshot")
+            graph.save_snapshot(snapshot)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                                     initializer=_open_snapshot, initargs=(snapshot,)) as executor:
+                futures = [executor.submit(check_pairs, chunk, engines, rel_tol, abs_tol) for chunk in chunks]
+                for future in futures:
+                    merge(future.result())
+    return {'checked': checked, 'max_error': max_error, 'mismatches': mismatches}
+
+
+def print_report(report, max_listed=10):
+    """Affiche le bilan par moteur et le détail des premiers désaccords."""
+    print("\n" + "="*80)
+    print(f" 🔎 VÉRIFICATION CROISÉE (référence : {REFERENCE})")
+    print("="*80)
+    print(f"{'Moteur':<20} {'Requêtes':>10} {'Désaccords':>12} {'Écart max':>12}")
+    for engine, checked in report['checked'].items():
+        count = sum(1 for m in report['mismatches'] if m['engine'] == engine)
+        flag = "❌" if count else "✅"
+        print(f"{engine:<20} {checked:>10} {count:>12} {report['max_error'][engine] * 100:>11.4f}% {flag}")
+
+    for m in report['mismatches'][:max_listed]:
+        i = _divergence(m['expected_path'], m['path'])
+        print(f"\n❌ {m['engine']} : {m['start']} → {m['end']}")
+        print(f"   {REFERENCE:<12}: {m['expected']:.6f} km, {len(m['expected_path'])} nœuds")
+        print(f"   {m['engine']:<12}: {m['distance']:.6f} km, {len(m['path'])} nœuds "
+              f"({m['relative_error'] * 100:+.4f} %)")
+        print(f"   Chemins identiques jusqu'au nœud {i} "
+              f"({m['expected_path'][i - 1] if i > 0 else '-'}), puis "
+              f"{m['expected_path'][i:i + 3]} contre {m['path'][i:i + 3]}")
+    if len(report['mismatches']) > max_listed:
+        print(f"\n... {len(report['mismatches']) - max_listed} autres désaccords (voir --report)")
+
+
+def main():
+    from regression_suite import sample_pairs
+
+    parser = argparse.ArgumentParser(description="Compare les distances de tous les moteurs à celles de Dijkstra.")
+    parser.add_argument("nodes_file", nargs="?", help="Fichier des nœuds (.csv ou .parquet).")
+    parser.add_argument("ways_file", nargs="?", help="Fichier des chemins (.csv ou .parquet).")
+    parser.add_argument("--snapshot", default=None, help="Instantané à utiliser à la place des fichiers.")
+    parser.add_argument("--pairs", type=int, default=1000, help="Nombre de couples tirés au hasard.")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du tirage des couples.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=None,
+                        help="Moteurs comparés (tous par défaut).")
+    parser.add_argument("--rel-tol", type=float, default=1e-9, help="Écart relatif toléré.")
+    parser.add_argument("--abs-tol", type=float, default=1e-9, help="Écart absolu toléré (km).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Nombre de processus.")
+    parser.add_argument("--report", default=None, help="Fichier JSON où écrire tous les désaccords.")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        graph = Graph.load_snapshot(args.snapshot)
+    elif args.nodes_file and args.ways_file:
+        graph = Graph()
+        graph.load_from_csv(args.nodes_file, args.ways_file)
+        graph.build_arrays()
+    else:
+        parser.error("fichiers des nœuds et des chemins ou --snapshot requis")
+
+    pairs = sample_pairs(graph, args.pairs, args.seed)
+    start_time = time.time()
+    report = cross_check(graph, pairs, args.engines, args.rel_tol, args.abs_tol, args.workers)
+    elapsed = time.time() - start_time
+    print_report(report)
+    print(f"\n⏱️  {len(pairs)} couples vérifiés en {elapsed:.2f} s ({args.workers} processus)")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    raise SystemExit(1 if report['mismatches'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,30 @@
 import math
-import polars as pl
+from array import array
+from priority_queues import make_queue, queue_stats
+from path_result import PathResult
+from instrumentation import traced
+
+# Ordres de numérotation des nœuds acceptés par Graph.build_arrays
+NODE_ORDERS = ("osm", "bfs", "morton", "hilbert")
+
+# Version du format des instantanés écrits par Graph.save_snapshot
+SNAPSHOT_VERSION = 1
+
+def read_table(path):
+    """Lit un fichier de nœuds ou de chemins, au format CSV ou Parquet (osm2csv --format parquet).
+    
+    Args:
+        path (str): Chemin du fichier (.csv ou .parquet)
+        
+    Returns:
+        polars.DataFrame: Contenu du fichier, colonnes dans l'ordre d'osm2csv
+    """
+    # Import différé : un graphe ouvert depuis un instantané n'a pas besoin de Polars
+    import polars as pl
+    
+    if path.endswith(".parquet"):
+        return pl.read_parquet(path)
+    return pl.read_csv(path)
 
 class Node:
     """Classe représentant un nœud dans le graphe.
@@ -29,30 +54,71 @@ class Graph:
     
     Attributs:
         nodes (dict): Dictionnaire des nœuds avec leurs coordonnées {id: Node}
+        node_ids (list): Identifiants des nœuds par indice {indice: id}
+        node_index (dict): Indice de chaque nœud {id: indice}
+        components (array): Numéro de composante connexe par indice de nœud
+            (0 = plus grande composante), None tant qu'il n'est pas calculé
+        component_sizes (list): Nombre de nœuds de chaque composante
+        contracted (dict): Nœuds de forme retirés par simplify() {id: Node}
+        edge_geometry (dict): Nœuds intermédiaires des arêtes contractées
+            {(id1, id2): [ids de id1 vers id2]}
+        order (str): Ordre de numérotation des indices (voir NODE_ORDERS)
+        lat, lon (array): Coordonnées des nœuds par indice
+        adj_offsets (array): Début de la liste des voisins de chaque indice
+            (format CSR, None tant que build_arrays() n'a pas été appelé)
+        adj_targets (array): Indices des voisins, concaténés
+        adj_weights (array): Distances des arêtes, alignées sur adj_targets
+        heuristic_scale (float): Facteur appliqué à l'heuristique de A* pour
+            qu'elle reste admissible (voir calibrate_heuristic())
+        last_search_stats (dict): Compteurs de la dernière recherche
+            (file utilisée, insertions, extractions, diminutions de clé, nœuds traités)
     """
     
     def __init__(self):
         """Initialise un nouveau graphe vide."""
         self.nodes = {}  # {id: Node}
+        self.node_ids = []
+        self.node_index = {}
+        self.components = None
+        self.component_sizes = []
+        self.contracted = {}
+        self.edge_geometry = {}
+        self.order = "hilbert"
+        self.lat = None
+        self.lon = None
+        self.adj_offsets = None
+        self.adj_targets = None
+        self.adj_weights = None
+        self.heuristic_scale = 1.0
+        self.last_search_stats = {}
         
     def add_node(self, id, lat, lon, name):
         self.nodes[id] = Node(id, lat, lon, name)
+        self.components = None  # Étiquetage et tableaux à recalculer
+        self.adj_offsets = None
     
     def add_edge(self, id1, id2, distance):
         if id1 in self.nodes and id2 in self.nodes:
             self.nodes[id1].neighbors[id2] = distance
             self.nodes[id2].neighbors[id1] = distance  # Pour les routes bidirectionnelles
+            self.components = None
+            self.adj_offsets = None
 
-    def load_from_csv(self, nodes_file, ways_file):
-        """ Charge le graphe à partir des fichiers CSV.
+    @traced("load")
+    def load_from_csv(self, nodes_file, ways_file, largest_component_only=False):
+        """ Charge le graphe à partir des fichiers CSV (ou Parquet).
+        
+        Les composantes connexes sont étiquetées à la fin du chargement.
         
         Args:
-            nodes_file (str): Chemin vers le fichier des nœuds
-            ways_file (str): Chemin vers le fichier des routes
+            nodes_file (str): Chemin vers le fichier des nœuds (.csv ou .parquet)
+            ways_file (str): Chemin vers le fichier des routes (.csv ou .parquet)
+            largest_component_only (bool): Supprime les nœuds situés hors de
+                la plus grande composante connexe (îlots OSM)
         """
         
         # Load nodes with Polars
-        nodes_df = pl.read_csv(nodes_file)
+        nodes_df = read_table(nodes_file)
         for row in nodes_df.iter_rows():
             # Check for null values
             node_id = str(row[0]) if row[0] is not None else None
@@ -64,7 +130,7 @@ class Graph:
                 self.add_node(node_id, lat, lon, name)
 
         # Load ways with Polars
-        ways_df = pl.read_csv(ways_file)
+        ways_df = read_table(ways_file)
         for row in ways_df.iter_rows():
             node1 = str(row[2]) if row[2] is not None else None
             node2 = str(row[3]) if row[3] is not None else None
@@ -73,59 +139,794 @@ class Graph:
             if node1 is not None and node2 is not None:
                 self.add_edge(node1, node2, distance)
 
-    def dijkstra(self, start_id, end_id):
+        if largest_component_only:
+            self.prune_to_largest_component()
+        else:
+            self.compute_components()
+
+    @traced("components")
+    def compute_components(self, reindex=True):
+        """Étiquette les composantes connexes du graphe par parcours en largeur.
+        
+        Les composantes sont numérotées par taille décroissante : la
+        composante 0 est toujours la plus grande.
+        
+        Args:
+            reindex (bool): Renumérote les nœuds dans l'ordre du dictionnaire ;
+                False conserve la numérotation courante (build_arrays)
+        
+        Returns:
+            list: Taille de chaque composante
+        """
+        if reindex:
+            self.node_ids = list(self.nodes)
+            self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+            self.adj_offsets = None
+        labels = array('i', [-1]) * len(self.node_ids)
+        sizes = []
+        
+        for root in range(len(self.node_ids)):
+            if labels[root] != -1:
+                continue
+            label = len(sizes)
+            labels[root] = label
+            queue = [self.node_ids[root]]
+            for current in queue:  # La liste grandit pendant le parcours
+                for neighbor in self.nodes[current].neighbors:
+                    index = self.node_index[neighbor]
+                    if labels[index] == -1:
+                        labels[index] = label
+                        queue.append(neighbor)
+            sizes.append(len(queue))
+        
+        # Renumérotation par taille décroissante
+        order = sorted(range(len(sizes)), key=lambda label: -sizes[label])
+        rank = array('i', [0]) * len(sizes)
+        for new_label, old_label in enumerate(order):
+            rank[old_label] = new_label
+        self.components = array('i', (rank[label] for label in labels))
+        self.component_sizes = [sizes[label] for label in order]
+        return self.component_sizes
+
+    def is_reachable(self, id1, id2):
+        """Indique en O(1) si deux nœuds appartiennent à la même composante.
+        
+        Args:
+            id1 (str): Identifiant du premier nœud
+            id2 (str): Identifiant du second nœud
+            
+        Returns:
+            bool: True si un chemin existe entre les deux nœuds
+            
+        Raises:
+            ValueError: Si l'un des nœuds a été contracté par simplify()
+        """
+        for node_id in (id1, id2):
+            if node_id in self.contracted:
+                raise ValueError(f"Le nœud {node_id} a été contracté, "
+                                 f"ajoutez-le à 'keep' lors de la simplification")
+        if id1 not in self.nodes or id2 not in self.nodes:
+            return False
+        if self.components is None:
+            self.compute_components()
+        return self.components[self.node_index[id1]] == self.components[self.node_index[id2]]
+
+    def prune_to_largest_component(self):
+        """Supprime tous les nœuds situés hors de la plus grande composante.
+        
+        Returns:
+            int: Nombre de nœuds supprimés
+        """
+        if self.components is None:
+            self.compute_components()
+        removed = [node_id for node_id, label in zip(self.node_ids, self.components) if label != 0]
+        # Les voisins d'un nœud supprimé sont dans la même composante que lui
+        for node_id in removed:
+            del self.nodes[node_id]
+        self.compute_components()
+        return len(removed)
+
+    @traced("simplify")
+    def simplify(self, keep=()):
+        """Contracte les chaînes de nœuds de degré 2 en arêtes uniques.
+        
+        Les nœuds de forme (degré 2, sans nom) situés entre deux nœuds
+        conservés sont retirés du graphe et remplacés par une arête dont
+        le poids est la somme des segments. La liste des nœuds intermédiaires
+        est conservée dans edge_geometry pour pouvoir redévelopper les chemins.
+        
+        Args:
+            keep (iterable): Identifiants à conserver quoi qu'il arrive
+                (points de départ et d'arrivée des requêtes)
+            
+        Returns:
+            int: Nombre de nœuds contractés
+        """
+        keep = set(keep)
+        contracted = 0
+        # Un nœud conservé peut tomber au degré 2 quand une chaîne voisine
+        # disparaît : on recommence jusqu'à ce qu'il n'y ait plus rien à contracter
+        while True:
+            count = self._contract_chains(keep)
+            if not count:
+                break
+            contracted += count
+        
+        self.compute_components()
+        return contracted
+
+    def _contract_chains(self, keep):
+        """Contracte en un passage les chaînes de nœuds de degré 2 (voir simplify()).
+        
+        Returns:
+            int: Nombre de nœuds contractés pendant ce passage
+        """
+        removable = {node_id for node_id, node in self.nodes.items()
+                     if len(node.neighbors) == 2 and not node.name and node_id not in keep}
+        visited = set()
+        
+        def take_geometry(id1, id2):
+            # Géométrie d'une arête déjà contractée, dans le sens id1 -> id2
+            inner = self.edge_geometry.pop((id1, id2), None)
+            if inner is None:
+                inner = self.edge_geometry.pop((id2, id1), None)
+                inner = inner[::-1] if inner is not None else []
+            return list(inner)
+        
+        for anchor in [node_id for node_id in self.nodes if node_id not in removable]:
+            for first in list(self.nodes[anchor].neighbors):
+                if first not in removable or first in visited:
+                    continue
+                
+                # Parcours de la chaîne jusqu'au prochain nœud conservé, en
+                # reprenant la géométrie des arêtes contractées traversées
+                inner = take_geometry(anchor, first)
+                previous, current = anchor, first
+                total = self.nodes[anchor].neighbors[first]
+                while current in removable and current not in visited:
+                    visited.add(current)
+                    inner.append(current)
+                    a, b = self.nodes[current].neighbors
+                    following = b if a == previous else a
+                    total += self.nodes[current].neighbors[following]
+                    inner.extend(take_geometry(current, following))
+                    previous, current = current, following
+                
+                # Boucle sur elle-même ou chaîne refermée : pas d'arête à créer
+                if current == anchor or current in removable:
+                    continue
+                existing = self.nodes[anchor].neighbors.get(current)
+                if existing is None or total < existing:
+                    self.nodes[anchor].neighbors[current] = total
+                    self.nodes[current].neighbors[anchor] = total
+                    self.edge_geometry.pop((current, anchor), None)
+                    self.edge_geometry[(anchor, current)] = inner
+        
+        # Retrait des nœuds contractés (les cycles isolés restent intacts)
+        for node_id in visited:
+            node = self.nodes.pop(node_id)
+            for neighbor in node.neighbors:
+                if neighbor in self.nodes:
+                    self.nodes[neighbor].neighbors.pop(node_id, None)
+            self.contracted[node_id] = node
+        return len(visited)
+
+    @traced("index")
+    def build_arrays(self, order=None):
+        """Construit la liste d'adjacence sous forme de tableaux (format CSR).
+        
+        Les nœuds sont d'abord renumérotés pour que des nœuds proches
+        géographiquement aient des indices proches, ce qui améliore la
+        localité mémoire pendant les recherches :
+        - "osm" : ordre de chargement (identifiants OSM)
+        - "bfs" : ordre de parcours en largeur de chaque composante
+        - "morton" : courbe de Morton (ordre Z) sur lat/lon
+        - "hilbert" : courbe de Hilbert sur lat/lon
+        
+        Args:
+            order (str): Ordre de numérotation, self.order par défaut
+        """
+        order = order or self.order
+        if order not in NODE_ORDERS:
+            raise ValueError(f"Ordre inconnu : {order} (attendu : {', '.join(NODE_ORDERS)})")
+        
+        if order == "osm":
+            node_ids = list(self.nodes)
+        elif order == "bfs":
+            node_ids = self._bfs_order()
+        else:
+            node_ids = self._curve_order(order)
+        
+        # Étiquettes des composantes dans l'ancienne numérotation
+        components, old_index = self.components, self.node_index
+        self.order = order
+        self.node_ids = node_ids
+        self.node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        
+        nodes = [self.nodes[node_id] for node_id in node_ids]
+        self.lat = array('d', (node.lat for node in nodes))
+        self.lon = array('d', (node.lon for node in nodes))
+        
+        offsets = array('l', [0])
+        targets = array('l')
+        weights = array('d')
+        for node in nodes:
+            # Voisins triés par indice pour des accès mémoire croissants
+            neighbors = sorted((self.node_index[neighbor], distance)
+                               for neighbor, distance in node.neighbors.items())
+            targets.extend(index for index, _ in neighbors)
+            weights.extend(distance for _, distance in neighbors)
+            offsets.append(len(targets))
+        
+        self.adj_offsets, self.adj_targets, self.adj_weights = offsets, targets, weights
+        if components is None:
+            self.compute_components(reindex=False)
+        else:
+            # Étiquetage du chargement toujours valable : simple permutation
+            self.components = array('i', (components[old_index[node_id]] for node_id in node_ids))
+        self.calibrate_heuristic()
+
+    def calibrate_heuristic(self):
+        """Calcule le facteur qui rend l'heuristique de A* admissible.
+        
+        Les arêtes sont mesurées par geopy sur l'ellipsoïde, alors que
+        l'heuristique est une distance de Haversine sur une sphère de
+        6371 km : elle peut dépasser légèrement la longueur réelle d'une
+        arête. Avec s = min(w(u, v) / H(u, v)) sur toutes les arêtes,
+        s * H(u, v) <= w(u, v) pour chaque arête, et l'inégalité triangulaire
+        de H donne une heuristique s * H(., cible) cohérente, donc admissible.
+        
+        Returns:
+            float: Facteur retenu (self.heuristic_scale)
+        """
+        import numpy as np
+        
+        offsets = np.asarray(self.adj_offsets)
+        targets = np.asarray(self.adj_targets)
+        weights = np.asarray(self.adj_weights)
+        sources = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        # Les tableaux stockent lat/lon inversés : self.lon contient la latitude
+        lat, lon = np.radians(np.asarray(self.lon)), np.radians(np.asarray(self.lat))
+        a = (np.sin((lat[targets] - lat[sources]) / 2) ** 2
+             + np.cos(lat[sources]) * np.cos(lat[targets]) * np.sin((lon[targets] - lon[sources]) / 2) ** 2)
+        haversine = 6371.0 * 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        
+        # Les arêtes de longueur nulle à vol d'oiseau ne contraignent pas le facteur
+        measured = haversine > 0
+        self.heuristic_scale = float((weights[measured] / haversine[measured]).min()) if measured.any() else 1.0
+        return self.heuristic_scale
+
+    def _ensure_arrays(self):
+        """Construit les tableaux d'adjacence s'ils sont absents ou périmés."""
+        if self.adj_offsets is None or self.components is None:
+            self.build_arrays()
+
+    def _bfs_order(self):
+        """Renvoie les identifiants dans l'ordre d'un parcours en largeur."""
+        seen = set()
+        node_ids = []
+        for root in self.nodes:
+            if root in seen:
+                continue
+            seen.add(root)
+            i = len(node_ids)
+            node_ids.append(root)
+            while i < len(node_ids):  # La liste sert de file
+                for neighbor in self.nodes[node_ids[i]].neighbors:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        node_ids.append(neighbor)
+                i += 1
+        return node_ids
+
+    def _curve_order(self, order, bits=16):
+        """Trie les nœuds le long d'une courbe de remplissage de l'espace.
+        
+        Args:
+            order (str): "morton" ou "hilbert"
+            bits (int): Précision de la grille de quantification (2^bits cases par axe)
+            
+        Returns:
+            list: Identifiants des nœuds triés par position sur la courbe
+        """
+        import numpy as np
+        
+        node_ids = list(self.nodes)
+        if not node_ids:
+            return node_ids
+        lat = np.fromiter((node.lat for node in self.nodes.values()), dtype=np.float64, count=len(node_ids))
+        lon = np.fromiter((node.lon for node in self.nodes.values()), dtype=np.float64, count=len(node_ids))
+        
+        # Quantification des coordonnées sur une grille entière
+        side = (1 << bits) - 1
+        def quantize(values):
+            span = values.max() - values.min()
+            scaled = (values - values.min()) / span * side if span > 0 else np.zeros_like(values)
+            return scaled.astype(np.int64)
+        x, y = quantize(lon), quantize(lat)
+        
+        if order == "morton":
+            def spread(v):
+                v = (v | (v << 8)) & 0x00FF00FF
+                v = (v | (v << 4)) & 0x0F0F0F0F
+                v = (v | (v << 2)) & 0x33333333
+                return (v | (v << 1)) & 0x55555555
+            keys = spread(x) | (spread(y) << 1)
+        else:
+            keys = np.zeros_like(x)
+            s = 1 << (bits - 1)
+            while s > 0:
+                rx = (x & s) > 0
+                ry = (y & s) > 0
+                keys += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+                # Rotation du quadrant
+                flip = ~ry & rx
+                x = np.where(flip, side - x, x)
+                y = np.where(flip, side - y, y)
+                x, y = np.where(ry, x, y), np.where(ry, y, x)
+                s >>= 1
+        
+        return [node_ids[i] for i in np.argsort(keys, kind="stable")]
+
+    @traced("snapshot:save")
+    def save_snapshot(self, path):
+        """Enregistre le graphe sous forme de tableaux dans un instantané binaire.
+        
+        L'instantané contient la numérotation courante (ordre de
+        renumérotation compris), ce qui évite de relire les CSV.
+        
+        Args:
+            path (str): Chemin du fichier instantané
+        """
+        import pickle
+        
+        self._ensure_arrays()
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "order": self.order,
+            "node_ids": self.node_ids,
+            "names": [self.nodes[node_id].name for node_id in self.node_ids],
+            "lat": self.lat,
+            "lon": self.lon,
+            "adj_offsets": self.adj_offsets,
+            "adj_targets": self.adj_targets,
+            "adj_weights": self.adj_weights,
+            "components": self.components,
+            "component_sizes": self.component_sizes,
+            "contracted": [(node.id, node.lat, node.lon, node.name) for node in self.contracted.values()],
+            "edge_geometry": self.edge_geometry,
+            "heuristic_scale": self.heuristic_scale,
+        }
+        with open(path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    @traced("snapshot:load")
+    def load_snapshot(cls, path):
+        """Charge un graphe depuis un instantané écrit par save_snapshot().
+        
+        Args:
+            path (str): Chemin du fichier instantané
+            
+        Returns:
+            Graph: Graphe prêt pour les recherches, sans recalcul
+        """
+        import pickle
+        
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Version d'instantané non supportée : {snapshot.get('version')}")
+        
+        graph = cls()
+        node_ids = snapshot["node_ids"]
+        offsets, targets, weights = snapshot["adj_offsets"], snapshot["adj_targets"], snapshot["adj_weights"]
+        for i, node_id in enumerate(node_ids):
+            # Node inverse lat/lon à la construction
+            node = Node(node_id, snapshot["lon"][i], snapshot["lat"][i], snapshot["names"][i])
+            node.neighbors = {node_ids[targets[k]]: weights[k] for k in range(offsets[i], offsets[i + 1])}
+            graph.nodes[node_id] = node
+        for node_id, lat, lon, name in snapshot["contracted"]:
+            graph.contracted[node_id] = Node(node_id, lon, lat, name)
+        
+        graph.order = snapshot["order"]
+        graph.node_ids = node_ids
+        graph.node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        graph.lat, graph.lon = snapshot["lat"], snapshot["lon"]
+        graph.adj_offsets, graph.adj_targets, graph.adj_weights = offsets, targets, weights
+        graph.components = snapshot["components"]
+        graph.component_sizes = snapshot["component_sizes"]
+        graph.edge_geometry = snapshot["edge_geometry"]
+        if "heuristic_scale" in snapshot:
+            graph.heuristic_scale = snapshot["heuristic_scale"]
+        else:
+            graph.calibrate_heuristic()
+        return graph
+
+    def get_node(self, node_id):
+        """Renvoie un nœud du graphe, y compris s'il a été contracté."""
+        node = self.nodes.get(node_id)
+        return node if node is not None else self.contracted[node_id]
+
+    def edge_length(self, id1, id2):
+        """Renvoie la longueur de l'arête entre deux nœuds, contractés ou non (0 si absente)."""
+        distance = self.get_node(id1).neighbors.get(id2)
+        if distance is None:
+            # Les nœuds conservés ne référencent plus leurs voisins contractés
+            distance = self.get_node(id2).neighbors.get(id1, 0.0)
+        return distance
+
+    @traced("path:expand")
+    def expand_path(self, path):
+        """Réinsère les nœuds de forme contractés dans un chemin.
+        
+        Args:
+            path (list): Liste des identifiants des nœuds du chemin simplifié
+            
+        Returns:
+            list: Chemin complet avec toute la géométrie
+        """
+        if not self.edge_geometry or not path:
+            return list(path)
+        expanded = [path[0]]
+        for id1, id2 in zip(path, path[1:]):
+            inner = self.edge_geometry.get((id1, id2))
+            if inner is None:
+                inner = self.edge_geometry.get((id2, id1))
+                inner = inner[::-1] if inner is not None else ()
+            expanded.extend(inner)
+            expanded.append(id2)
+        return expanded
+
+    @traced("query:dijkstra")
+    def dijkstra(self, start_id, end_id, expand=False, queue="heapq"):
         """Trouve le plus court chemin entre deux points avec l'algorithme de Dijkstra.
         
         Args:
             start_id (str): Identifiant du nœud de départ
             end_id (str): Identifiant du nœud d'arrivée
+            expand (bool): Réinsère les nœuds contractés dans le chemin
+            queue (str): File de priorité ("heapq", "indexed" ou "bucket",
+                voir priority_queues.py)
             
         Returns:
             tuple: (distance totale, liste des identifiants des nœuds du chemin)
         """
-        from heapq import heappush, heappop
+        self._ensure_arrays()
+        if not self.is_reachable(start_id, end_id):
+            self.last_search_stats = dict(queue_stats(make_queue(queue)), settled=0)
+            return float('inf'), []
+        
+        end = self.node_index[end_id]
+        settled, distances, predecessors = self._dijkstra_search([self.node_index[start_id]], end=end, queue=queue)
+        if not settled or settled[-1] != end:
+            return float('inf'), []
+        return distances[end], self._path_from(predecessors, end, expand)
+
+    @traced("search:dijkstra")
+    def _dijkstra_search(self, sources, end=-1, max_distance=float('inf'), queue="heapq", target=-1):
+        """Noyau de Dijkstra sur les tableaux CSR, partagé par toutes les recherches.
         
-        distances = {start_id: 0}
-        predecessors = {start_id: None}
-        pq = [(0, start_id)]
+        La recherche s'arrête dès que `end` est extrait de la file, ou quand
+        tous les nœuds à moins de `max_distance` des sources ont été traités.
         
-        while pq:
-            dist, current = heappop(pq)
+        Args:
+            sources (list): Indices des nœuds de départ (distance 0)
+            end (int): Indice du nœud d'arrivée, -1 pour une recherche sans cible
+            max_distance (float): Distance au-delà de laquelle les nœuds sont ignorés
+            queue (str): File de priorité (voir priority_queues.py)
+            target (int): Si renseigné, max_distance borne la distance estimée
+                jusqu'à ce nœud (distance + heuristique de A*) : seuls sont
+                explorés les nœuds d'un chemin vers target de longueur au
+                plus max_distance. L'heuristique étant cohérente, leurs
+                distances restent exactes.
             
-            if current == end_id:
-                path = []
-                while current:
-                    path.append(current)
-                    current = predecessors[current]
-                return dist, path[::-1]
+        Returns:
+            tuple: (indices traités par distance croissante, distances {indice: km},
+                    prédécesseurs {indice: indice})
+        """
+        pq = make_queue(queue)
+        offsets, targets, weights = self.adj_offsets, self.adj_targets, self.adj_weights
+        # Marge restante de chaque nœud : max_distance - heuristique vers target
+        slack = self._heuristic_table(target, max_distance) if target != -1 else None
+        distances = {}
+        predecessors = {}
+        push, pop = pq.push, pq.pop
+        for source in sources:
+            distances[source] = 0
+            predecessors[source] = -1
+            push(0, source)  # (distance, indice) : comparaisons entre entiers
+        settled = array('l')
+        
+        while pq:
+            dist, current = pop()
             
-            if current in distances and dist > distances[current]:
+            if dist > distances[current]:
                 continue
+            settled.append(current)
+            
+            if current == end:
+                break
             
-            # Accès direct aux voisins O(1) au lieu de O(E)
-            for neighbor, edge_dist in self.nodes[current].neighbors.items():
-                new_dist = dist + edge_dist
+            # Voisins contigus en mémoire dans les tableaux CSR
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                new_dist = dist + weights[k]
                 
-                if neighbor not in distances or new_dist < distances[neighbor]:
+                if new_dist <= max_distance and (neighbor not in distances or new_dist < distances[neighbor]):
+                    if slack is not None and new_dist > slack[neighbor]:
+                        continue  # Aucun chemin vers target dans la borne
                     distances[neighbor] = new_dist
                     predecessors[neighbor] = current
-                    heappush(pq, (new_dist, neighbor))
+                    push(new_dist, neighbor)
+        
+        self.last_search_stats = dict(queue_stats(pq), settled=len(settled))
+        return settled, distances, predecessors
+
+    @traced("query:bounded")
+    def bounded_dijkstra(self, sources, max_distance, queue="heapq"):
+        """Renvoie tous les nœuds atteignables dans un budget de distance.
+        
+        Args:
+            sources (str | list): Identifiant(s) du ou des nœuds de départ
+            max_distance (float): Budget de distance en km
+            queue (str): File de priorité (voir priority_queues.py)
+            
+        Returns:
+            tuple: (array des indices atteints, array de leurs distances en km),
+                triés par distance croissante ; node_ids donne l'identifiant OSM
+        """
+        self._ensure_arrays()
+        if isinstance(sources, str):
+            sources = [sources]
+        indices = [self.node_index[source] for source in sources if source in self.node_index]
+        settled, distances, _ = self._dijkstra_search(indices, max_distance=max_distance, queue=queue)
+        return settled, array('d', (distances[index] for index in settled))
+
+    @traced("query:isochrones")
+    def isochrones(self, sources, budgets, queue="heapq"):
+        """Calcule plusieurs isochrones (ex : 1/5/10 km) en une seule recherche.
+        
+        Args:
+            sources (str | list): Identifiant(s) du ou des nœuds de départ
+            budgets (list): Budgets de distance en km
+            queue (str): File de priorité (voir priority_queues.py)
+            
+        Returns:
+            dict: {budget: (array des indices, array des distances)} ; chaque
+                isochrone contient les nœuds des budgets inférieurs
+        """
+        from bisect import bisect_right
         
-        return float('inf'), []
+        budgets = sorted(budgets)
+        if not budgets:
+            return {}
+        indices, distances = self.bounded_dijkstra(sources, budgets[-1], queue=queue)
+        # Nœuds triés par distance : chaque isochrone est un préfixe
+        return {budget: (indices[:bisect_right(distances, budget)], distances[:bisect_right(distances, budget)])
+                for budget in budgets}
 
-    def print_path(self, path, total_distance):
+    @traced("path")
+    def _path_from(self, predecessors, end, expand=False):
+        """Reconstruit la liste des identifiants à partir des prédécesseurs.
+        
+        Args:
+            predecessors (dict): Prédécesseur de chaque indice {indice: indice}, -1 pour le départ
+            end (int): Indice du nœud d'arrivée
+            expand (bool): Réinsère les nœuds contractés dans le chemin
+            
+        Returns:
+            list: Identifiants des nœuds du départ vers l'arrivée
+        """
+        path = [self.node_ids[index] for index in self._index_path(predecessors, end)]
+        return self.expand_path(path) if expand else path
+
+    def _index_path(self, predecessors, end):
+        """Reconstruit le chemin sous forme de tableau d'indices, du départ vers l'arrivée."""
+        path = array('l')
+        current = end
+        while current != -1:
+            path.append(current)
+            current = predecessors[current]
+        path.reverse()
+        return path
+
+    @traced("query:shortest_path")
+    def shortest_path(self, start_id, end_id, algorithm="dijkstra", queue="heapq", epsilon=0.0):
+        """Calcule un plus court chemin et le renvoie sous forme de PathResult.
+        
+        Contrairement à dijkstra() et a_star(), le chemin reste un tableau
+        d'indices : identifiants, distances par segment et export GeoJSON
+        ne sont calculés que s'ils sont demandés.
+        
+        Args:
+            start_id (str): Identifiant du nœud de départ
+            end_id (str): Identifiant du nœud d'arrivée
+            algorithm (str): "dijkstra" ou "a_star"
+            queue (str): File de priorité (voir priority_queues.py)
+            epsilon (float): Pondération de A* (voir a_star())
+            
+        Returns:
+            PathResult: Chemin trouvé (vide, distance inf si aucun chemin),
+                avec la borne de sous-optimalité garantie (bound)
+        """
+        self._ensure_arrays()
+        if not self.is_reachable(start_id, end_id):
+            return PathResult(self, [], float('inf'), algorithm)
+        
+        start, end = self.node_index[start_id], self.node_index[end_id]
+        bound = 1.0
+        if algorithm == "dijkstra":
+            settled, distances, predecessors = self._dijkstra_search([start], end=end, queue=queue)
+            distance = distances[end] if settled and settled[-1] == end else float('inf')
+        elif algorithm == "a_star":
+            distance, predecessors = self._a_star_search(start, end, queue=queue, epsilon=epsilon)
+            bound = 1.0 + epsilon
+        else:
+            raise ValueError(f"Algorithme inconnu : {algorithm}")
+        
+        if distance == float('inf'):
+            return PathResult(self, [], distance, algorithm, bound)
+        return PathResult(self, self._index_path(predecessors, end), distance, algorithm, bound)
+
+    @traced("query:alternatives")
+    def alternatives(self, start_id, end_id, k=3, max_stretch=1.25, max_overlap=0.7,
+                     method="plateau", penalty=1.4, queue="heapq"):
+        """Calcule jusqu'à k itinéraires différents entre deux points.
+        
+        Le premier itinéraire est toujours le plus court. Les suivants sont
+        au plus max_stretch fois plus longs et partagent au plus max_overlap
+        de leur longueur avec chacun des itinéraires déjà retenus.
+        
+        Deux méthodes sont disponibles :
+        - "plateau" : une recherche depuis le départ et une depuis l'arrivée,
+          bornées à max_stretch × la distance optimale. Les portions communes
+          aux deux arbres de plus courts chemins (plateaux) donnent des
+          itinéraires alternatifs localement optimaux. Coût : une recherche
+          A* et deux recherches bornées, guidées par l'heuristique de A*,
+          quel que soit k.
+        - "penalty" : des recherches A* successives où les arêtes des
+          itinéraires déjà trouvés sont pénalisées, bornées à
+          max_stretch × penalty × la distance optimale (au plus 2k
+          recherches, arrêt dès que k itinéraires sont retenus).
+        
+        Args:
+            start_id (str): Identifiant du nœud de départ
+            end_id (str): Identifiant du nœud d'arrivée
+            k (int): Nombre maximal d'itinéraires
+            max_stretch (float): Rapport maximal à la distance optimale
+            max_overlap (float): Part maximale de longueur partagée (0 à 1)
+            method (str): "plateau" ou "penalty"
+            penalty (float): Facteur appliqué aux arêtes déjà utilisées ("penalty")
+            queue (str): File de priorité (voir priority_queues.py)
+            
+        Returns:
+            list: PathResult triés par ordre de sélection, le plus court en premier
+        """
+        self._ensure_arrays()
+        if not self.is_reachable(start_id, end_id) or k < 1:
+            return []
+        start, end = self.node_index[start_id], self.node_index[end_id]
+        
+        if method == "plateau":
+            candidates = self._plateau_candidates(start, end, max_stretch, queue)
+        elif method == "penalty":
+            candidates = self._penalty_candidates(start, end, k, max_stretch, penalty, queue)
+        else:
+            raise ValueError(f"Méthode inconnue : {method} (attendu : plateau, penalty)")
+        
+        selected, selected_edges = [], []
+        best = None
+        for result in candidates:
+            if best is None:
+                best = result.distance
+            if result.distance > max_stretch * best or len(set(result.indices)) != len(result.indices):
+                continue
+            edges = {(min(i, j), max(i, j)): length for i, j, length
+                     in zip(result.indices, result.indices[1:], result.segment_distances)}
+            if any(sum(length for edge, length in edges.items() if edge in other) > max_overlap * result.distance
+                   for other in selected_edges):
+                continue
+            selected.append(result)
+            selected_edges.append(edges)
+            if len(selected) == k:
+                break
+        return selected
+
+    def _plateau_candidates(self, start, end, max_stretch, queue):
+        """Génère les itinéraires candidats de la méthode des plateaux.
+        
+        Le plus court chemin est produit en premier, puis un itinéraire par
+        plateau, du plus long plateau au plus court.
+        """
+        # Distance optimale pour borner les deux recherches
+        distance, _ = self._a_star_search(start, end, queue=queue)
+        bound = max_stretch * distance
+        # Les nœuds v tels que d(départ, v) + d(v, arrivée) > bound sont
+        # écartés par le filtre des plateaux : chaque recherche s'arrête aux
+        # nœuds dont la distance plus l'heuristique vers l'autre extrémité
+        # dépasse la borne
+        forward, forward_distances, forward_parents = self._dijkstra_search(
+            [start], max_distance=bound, queue=queue, target=end)
+        _, backward_distances, backward_parents = self._dijkstra_search(
+            [end], max_distance=bound, queue=queue, target=start)
+        
+        if end in forward_parents:
+            yield PathResult(self, self._index_path(forward_parents, end), forward_distances[end])
+        
+        # Plateaux : arêtes présentes dans les deux arbres, dans le même sens
+        head = {}
+        plateau_length = {}
+        for v in forward:  # Ordre de distance croissante depuis le départ
+            if v not in backward_distances or forward_distances[v] + backward_distances[v] > bound:
+                continue
+            u = forward_parents[v]
+            if u != -1 and backward_parents.get(u) == v:
+                head[v] = head.get(u, u)
+                plateau_length[head[v]] = forward_distances[v] - forward_distances[head[v]]
+        
+        for first in sorted(plateau_length, key=plateau_length.get, reverse=True):
+            # Départ -> début du plateau (arbre avant), puis plateau -> arrivée (arbre arrière)
+            path = self._index_path(forward_parents, first)
+            current = backward_parents[first]
+            while current != -1:
+                path.append(current)
+                current = backward_parents[current]
+            yield PathResult(self, path, forward_distances[first] + backward_distances[first])
+
+    def _penalty_candidates(self, start, end, k, max_stretch, penalty, queue):
+        """Génère les itinéraires candidats de la méthode des pénalités.
+        
+        Les pénalités (>= 1) ne font qu'allonger les arêtes : l'heuristique
+        calibrée de A* reste admissible sur les poids pénalisés. Chaque
+        recherche est bornée à max_stretch × penalty × la distance optimale,
+        les itinéraires plus coûteux étant de toute façon trop pénalisés.
+        Le générateur est consommé par alternatives(), qui s'arrête dès que
+        k itinéraires sont retenus.
+        """
+        if penalty < 1:
+            raise ValueError(f"La pénalité doit être supérieure ou égale à 1 : {penalty}")
+        offsets, targets = self.adj_offsets, self.adj_targets
+        weights = array('d', self.adj_weights)
+        bound = float('inf')
+        for _ in range(2 * k):
+            cost, predecessors = self._a_star_search(start, end, queue=queue, weights=weights, max_distance=bound)
+            if cost == float('inf'):
+                return
+            if bound == float('inf'):
+                # Première recherche : plus court chemin, sans pénalité
+                bound = max_stretch * penalty * cost
+            result = PathResult(self, self._index_path(predecessors, end), 0.0)
+            # Distance réelle, sans les pénalités
+            result.distance = sum(result.segment_distances)
+            yield result
+            
+            # Pénalisation des arêtes utilisées, dans les deux sens
+            for i, j in zip(result.indices, result.indices[1:]):
+                for a, b in ((i, j), (j, i)):
+                    for position in range(offsets[a], offsets[a + 1]):
+                        if targets[position] == b:
+                            weights[position] *= penalty
+
+    def print_path(self, path, total_distance, expand=False):
         """ Affiche le chemin trouvé avec les détails des nœuds.
         
         Args:
             path (list): Liste des identifiants des nœuds du chemin
             total_distance (float): Distance totale du chemin
+            expand (bool): Affiche aussi les nœuds contractés par simplify()
         """
+        if expand:
+            path = self.expand_path(path)
+        cumulative = 0.0
         for i, node_id in enumerate(path):
-            node = self.nodes[node_id]
+            node = self.get_node(node_id)
             if i == 0:
                 print(f"{i} - From: ['{node_id}', '{node.name or 'None'}', '{node.lat}', '{node.lon}']")
             else:
-                print(f"{i} - To: ['{node_id}', '{node.name or 'None'}', '{node.lat}', '{node.lon}']: distance = {total_distance if i == len(path)-1 else 0} km")
+                # Distance cumulée depuis le départ (auparavant 0 pour les étapes intermédiaires)
+                cumulative += self.edge_length(path[i - 1], node_id)
+                print(f"{i} - To: ['{node_id}', '{node.name or 'None'}', '{node.lat}', '{node.lon}']: distance = {total_distance if i == len(path)-1 else cumulative:.3f} km")
 
     def haversine_distance(self, id1, id2):
         """Calcule la distance de Haversine entre deux points.
@@ -143,9 +944,9 @@ class Graph:
         node1 = self.nodes[id1]
         node2 = self.nodes[id2]
         
-        # Correction de l'inversion lat/lon
-        lat1, lon1 = math.radians(node1.lat), math.radians(node1.lon)
-        lat2, lon2 = math.radians(node2.lat), math.radians(node2.lon)
+        # Correction de l'inversion lat/lon (Node.lon contient la latitude)
+        lat1, lon1 = math.radians(node1.lon), math.radians(node1.lat)
+        lat2, lon2 = math.radians(node2.lon), math.radians(node2.lat)
         
         # Rayon de la Terre en km
         R = 6371.0
@@ -157,47 +958,139 @@ class Graph:
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
         return R * c
 
-    def a_star(self, start_id, end_id):
+    @traced("query:a_star")
+    def a_star(self, start_id, end_id, expand=False, queue="heapq", epsilon=0.0):
         """Trouve le plus court chemin entre deux points avec l'algorithme A*.
         
-        Utilise une heuristique (distance de Haversine) pour optimiser la recherche
-        par rapport à l'algorithme de Dijkstra.
+        Utilise une heuristique (distance de Haversine ramenée par
+        heuristic_scale) pour optimiser la recherche par rapport à
+        l'algorithme de Dijkstra, sans perdre l'optimalité.
+        
+        Avec epsilon > 0 (A* pondéré), l'heuristique est multipliée par
+        1 + epsilon : la recherche traite beaucoup moins de nœuds et le
+        chemin obtenu est au plus (1 + epsilon) fois plus long que l'optimal.
+        La borne est reportée dans last_search_stats['bound'].
         
         Args:
             start_id (str): Identifiant du nœud de départ
             end_id (str): Identifiant du nœud d'arrivée
+            expand (bool): Réinsère les nœuds contractés dans le chemin
+            queue (str): File de priorité ("heapq", "indexed" ou "bucket",
+                voir priority_queues.py)
+            epsilon (float): Sous-optimalité acceptée (0 = chemin optimal)
             
         Returns:
             tuple: (distance totale, liste des identifiants des nœuds du chemin)
         """
-        from heapq import heappush, heappop
-        import math
+        self._ensure_arrays()
+        if not self.is_reachable(start_id, end_id):
+            self.last_search_stats = dict(queue_stats(make_queue(queue)), settled=0,
+                                          epsilon=epsilon, bound=1.0 + epsilon)
+            return float('inf'), []
+        
+        end = self.node_index[end_id]
+        distance, came_from = self._a_star_search(self.node_index[start_id], end, queue=queue, epsilon=epsilon)
+        if distance == float('inf'):
+            return distance, []  # No path found
+        return distance, self._path_from(came_from, end, expand)
+
+    def _heuristic_table(self, end, max_distance):
+        """Calcule max_distance moins l'heuristique de A* pour tous les nœuds.
+        
+        Vectorisé avec numpy : pour les recherches bornées qui évaluent
+        l'heuristique sur une grande partie du graphe.
+        
+        Args:
+            end (int): Indice du nœud cible
+            max_distance (float): Borne de la recherche (km)
+            
+        Returns:
+            list: Marge par indice de nœud (km)
+        """
+        import numpy as np
+        
+        # Les tableaux stockent lat/lon inversés : self.lon contient la latitude
+        lat = np.radians(np.frombuffer(self.lon, dtype=np.float64))
+        lon = np.radians(np.frombuffer(self.lat, dtype=np.float64))
+        a = (np.sin((lat[end] - lat) / 2) ** 2
+             + np.cos(lat) * np.cos(lat[end]) * np.sin((lon[end] - lon) / 2) ** 2)
+        heuristic = 6371.0 * self.heuristic_scale * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return (max_distance - heuristic).tolist()
+
+    @traced("search:a_star")
+    def _a_star_search(self, start, end, queue="heapq", epsilon=0.0, weights=None, max_distance=float('inf')):
+        """Noyau de A* sur les tableaux CSR.
+        
+        Args:
+            start (int): Indice du nœud de départ
+            end (int): Indice du nœud d'arrivée
+            queue (str): File de priorité (voir priority_queues.py)
+            epsilon (float): Pondération de l'heuristique (voir a_star())
+            weights (array): Poids à utiliser à la place de adj_weights ; ils
+                doivent être au moins égaux aux longueurs pour que
+                l'heuristique reste admissible (pénalités >= 1)
+            max_distance (float): Coût estimé (g + h) au-delà duquel les
+                nœuds sont ignorés ; avec epsilon = 0, aucun chemin plus
+                court que la borne n'est écarté
+            
+        Returns:
+            tuple: (distance en km ou inf, prédécesseurs {indice: indice})
+        """
+        if epsilon < 0:
+            raise ValueError(f"epsilon doit être positif ou nul : {epsilon}")
+        open_set = make_queue(queue)
+        offsets, targets = self.adj_offsets, self.adj_targets
+        if weights is None:
+            weights = self.adj_weights
+        # Les tableaux stockent lat/lon inversés : self.lon contient la latitude
+        lat, lon = self.lon, self.lat
+        
+        # Haversine vers la destination, constantes précalculées ; le
+        # facteur de calibration rend l'heuristique admissible
+        R = 6371.0 * self.heuristic_scale * (1.0 + epsilon)
+        end_lat, end_lon = math.radians(lat[end]), math.radians(lon[end])
+        cos_end = math.cos(end_lat)
+        def heuristic(i):
+            lat_i = math.radians(lat[i])
+            a = (math.sin((end_lat - lat_i) / 2) ** 2
+                 + math.cos(lat_i) * cos_end * math.sin((end_lon - math.radians(lon[i])) / 2) ** 2)
+            return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
         
         # Initialisation
-        g_score = {start_id: 0}  # Real cost from start
-        f_score = {start_id: self.haversine_distance(start_id, end_id)}  # Estimated total cost
-        came_from = {start_id: None}
-        open_set = [(f_score[start_id], start_id)]  # (f_score, node_id)
+        g_score = {start: 0}  # Real cost from start
+        f_score = {start: heuristic(start)}  # Estimated total cost
+        came_from = {start: -1}
+        push, pop = open_set.push, open_set.pop
+        push(f_score[start], start)  # (f_score, indice)
+        settled = 0
         
         while open_set:
-            current_f, current = heappop(open_set)
+            current_f, current = pop()
+            
+            if current == end:
+                self.last_search_stats = dict(queue_stats(open_set), settled=settled + 1,
+                                              epsilon=epsilon, bound=1.0 + epsilon)
+                return g_score[end], came_from
             
-            if current == end_id:
-                # Path reconstruction
-                path = []
-                while current:
-                    path.append(current)
-                    current = came_from[current]
-                return g_score[end_id], path[::-1]
+            if current_f > f_score[current]:
+                continue  # Entrée périmée
+            settled += 1
+            current_g = g_score[current]
             
             # Explore neighbors
-            for neighbor, edge_dist in self.nodes[current].neighbors.items():
-                tentative_g = g_score[current] + edge_dist
+            for k in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[k]
+                tentative_g = current_g + weights[k]
                 
                 if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    neighbor_f = tentative_g + heuristic(neighbor)
+                    if neighbor_f > max_distance:
+                        continue  # Ne peut pas atteindre l'arrivée dans la borne
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self.haversine_distance(neighbor, end_id)
-                    heappush(open_set, (f_score[neighbor], neighbor))
+                    f_score[neighbor] = neighbor_f
+                    push(neighbor_f, neighbor)
         
-        return float('inf'), []  # No path found
\ No newline at end of file
+        self.last_search_stats = dict(queue_stats(open_set), settled=settled,
+                                      epsilon=epsilon, bound=1.0 + epsilon)
+        return float('inf'), came_from
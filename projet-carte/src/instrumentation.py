@@ -0,0 +1,217 @@
+"""
+Instrumentation du pipeline de calcul d'itinéraires.
+
+Les étapes (chargement, construction des index, recherche, reconstruction
+du chemin) sont entourées de zones nommées :
+
+    with span("search", algorithm="dijkstra"):
+        ...
+
+Tant que le traçage n'est pas activé, span() renvoie un objet vide partagé :
+le coût se limite à un appel de fonction par zone. Une fois activé avec
+enable(), chaque zone est enregistrée et peut être exportée :
+- au format Chrome trace-event (chrome://tracing, Perfetto)
+- en piles repliées pour les flamegraphs (flamegraph.pl, speedscope)
+- sous forme de tableau récapitulatif par étape
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+_tracer = None
+
+
+class _NullSpan:
+    """Zone vide utilisée lorsque le traçage est désactivé."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Zone nommée enregistrée par un Tracer."""
+
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.tracer._stack().append(self.name)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        stack = self.tracer._stack()
+        self.tracer._record(self.name, self.args, self.start, end, tuple(stack))
+        stack.pop()
+        return False
+
+
+class Tracer:
+    """Collecteur des zones exécutées pendant que le traçage est actif.
+
+    Attributs:
+        events (list): Zones terminées (nom, arguments, début ns, fin ns,
+            pile des zones englobantes, thread)
+    """
+
+    def __init__(self):
+        self.events = []
+        self.origin = time.perf_counter_ns()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def span(self, name, args):
+        return _Span(self, name, args)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name, args, start, end, stack):
+        with self._lock:
+            self.events.append((name, args, start, end, stack, threading.get_ident()))
+
+    def chrome_trace(self):
+        """Renvoie les zones au format Chrome trace-event (durées en µs)."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": stack[0],
+                    "ph": "X",
+                    "ts": (start - self.origin) / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+                for name, args, start, end, stack, tid in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def collapsed_stacks(self):
+        """Renvoie le temps propre (µs) de chaque pile de zones.
+
+        Le temps propre d'une zone est sa durée moins celle des zones
+        qu'elle contient directement.
+        """
+        totals = {}
+        children = {}
+        for name, args, start, end, stack, tid in self.events:
+            duration = end - start
+            totals[stack] = totals.get(stack, 0) + duration
+            if len(stack) > 1:
+                children[stack[:-1]] = children.get(stack[:-1], 0) + duration
+        return {";".join(stack): max(total - children.get(stack, 0), 0) // 1000
+                for stack, total in totals.items()}
+
+    def summary(self):
+        """Agrège les zones par nom.
+
+        Returns:
+            dict: {nom: {'count', 'total', 'mean', 'max'}} (durées en secondes)
+        """
+        stages = {}
+        for name, args, start, end, stack, tid in self.events:
+            duration = (end - start) / 1e9
+            stage = stages.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            stage['count'] += 1
+            stage['total'] += duration
+            stage['max'] = max(stage['max'], duration)
+        for stage in stages.values():
+            stage['mean'] = stage['total'] / stage['count']
+        return stages
+
+
+def enable():
+    """Active le traçage et renvoie le Tracer qui collecte les zones."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    """Désactive le traçage et renvoie le Tracer qui était actif (ou None)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def span(name, **args):
+    """Ouvre une zone nommée, à utiliser avec `with`.
+
+    Args:
+        name (str): Nom de l'étape (ex : "load", "index", "search", "path")
+        **args: Informations jointes à la zone dans la trace Chrome
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, args)
+
+
+def traced(name):
+    """Décorateur entourant chaque appel de la fonction d'une zone nommée.
+
+    Désactivé, il ne coûte qu'un test avant l'appel de la fonction.
+
+    Args:
+        name (str): Nom de l'étape
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with _tracer.span(name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def export_chrome_trace(path, tracer=None):
+    """Écrit la trace au format JSON Chrome trace-event."""
+    tracer = tracer or _tracer
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tracer.chrome_trace(), f)
+
+
+def export_collapsed(path, tracer=None):
+    """Écrit les piles repliées (une ligne « a;b;c durée_µs » par pile)."""
+    tracer = tracer or _tracer
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, self_time in sorted(tracer.collapsed_stacks().items()):
+            f.write(f"{stack} {self_time}\n")
+
+
+def print_summary(tracer=None):
+    """Affiche le tableau récapitulatif du temps passé par étape."""
+    tracer = tracer or _tracer
+    stages = tracer.summary()
+    print("\n" + "="*80)
+    print(" ⏱️  TEMPS PAR ÉTAPE")
+    print("="*80)
+    print(f"{'Étape':<24} {'Appels':>8} {'Total (s)':>12} {'Moyenne (s)':>12} {'Max (s)':>12}")
+    for name, stage in sorted(stages.items(), key=lambda item: -item[1]['total']):
+        print(f"{name:<24} {stage['count']:>8} {stage['total']:>12.4f} {stage['mean']:>12.6f} {stage['max']:>12.6f}")
@@ -1,8 +1,8 @@
 import csv
-import pandas as pd
-import polars as pl
 import time
-from graph import Graph
+from array import array
+from graph import Graph, read_table
+from instrumentation import traced
 
 class GraphCSV(Graph):
     def load_from_csv(self, nodes_file, ways_file):
@@ -35,20 +35,29 @@ class GraphPandas(Graph):
         """Charge les données avec Pandas.
         
         Args:
-            nodes_file (str): Chemin vers le fichier des nœuds
-            ways_file (str): Chemin vers le fichier des routes
+            nodes_file (str): Chemin vers le fichier des nœuds (.csv ou .parquet)
+            ways_file (str): Chemin vers le fichier des routes (.csv ou .parquet)
         """
+        import pandas as pd
+
         start_time = time.time()
 
-        # Lecture des noeuds avec types spécifiés
-        df_nodes = pd.read_csv(nodes_file, 
-                            usecols=["id", "lat", "lon", "name"],
-                            dtype={"id": str, "lat": float, "lon": float, "name": str})
+        if nodes_file.endswith(".parquet"):
+            # Fichiers Parquet déjà typés : seuls les identifiants sont convertis
+            df_nodes = pd.read_parquet(nodes_file, columns=["id", "lat", "lon", "name"])
+            df_nodes["id"] = df_nodes["id"].astype(str)
+            df_ways = pd.read_parquet(ways_file, columns=["node_from", "node_to", "distance_km"])
+            df_ways[["node_from", "node_to"]] = df_ways[["node_from", "node_to"]].astype(str)
+        else:
+            # Lecture des noeuds avec types spécifiés
+            df_nodes = pd.read_csv(nodes_file, 
+                                usecols=["id", "lat", "lon", "name"],
+                                dtype={"id": str, "lat": float, "lon": float, "name": str})
 
-        # Lecture des chemins avec types spécifiés
-        df_ways = pd.read_csv(ways_file, 
-                            usecols=["node_from", "node_to", "distance_km"],
-                            dtype={"node_from": str, "node_to": str, "distance_km": float})
+            # Lecture des chemins avec types spécifiés
+            df_ways = pd.read_csv(ways_file, 
+                                usecols=["node_from", "node_to", "distance_km"],
+                                dtype={"node_from": str, "node_to": str, "distance_km": float})
 
         # Construction du graphe - Noeuds
         for row in df_nodes.itertuples(index=False):
@@ -67,13 +76,13 @@ class GraphPolars(Graph):
         """Charge les données avec Polars.
         
         Args:
-            nodes_file (str): Chemin vers le fichier des nœuds
-            ways_file (str): Chemin vers le fichier des routes
+            nodes_file (str): Chemin vers le fichier des nœuds (.csv ou .parquet)
+            ways_file (str): Chemin vers le fichier des routes (.csv ou .parquet)
         """
         start_time = time.time()
 
         # Load nodes with Polars
-        nodes_df = pl.read_csv(nodes_file)
+        nodes_df = read_table(nodes_file)
         for row in nodes_df.iter_rows():
             # Check for null values
             node_id = str(row[0]) if row[0] is not None else None
@@ -85,7 +94,7 @@ class GraphPolars(Graph):
                 self.add_node(node_id, lat, lon, name)
 
         # Load ways with Polars
-        ways_df = pl.read_csv(ways_file)
+        ways_df = read_table(ways_file)
         for row in ways_df.iter_rows():
             node1 = str(row[2]) if row[2] is not None else None
             node2 = str(row[3]) if row[3] is not None else None
@@ -98,8 +107,100 @@ class GraphPolars(Graph):
         print(f"Chargement du fichier CSV avec le module 'polars' terminé en {end_time - start_time:.2f} s.")
 
 
+class GraphStreaming(Graph):
+    @traced("load:streaming")
+    def load_from_csv(self, nodes_file, ways_file, largest_component_only=False, chunk_size=250_000):
+        """Charge les données par blocs avec un scan paresseux Polars (CSV ou Parquet).
+        
+        Le fichier des routes n'est jamais lu en entier : chaque bloc est
+        analysé par Polars (sur tous les cœurs), ses identifiants OSM sont
+        convertis en indices de nœuds de manière vectorisée, puis les arêtes
+        sont ajoutées à des tableaux extensibles. La mémoire utilisée pour la
+        lecture reste bornée par la taille des blocs.
+        
+        Args:
+            nodes_file (str): Chemin vers le fichier des nœuds (.csv ou .parquet)
+            ways_file (str): Chemin vers le fichier des routes (.csv ou .parquet)
+            largest_component_only (bool): Supprime les nœuds hors de la plus grande composante
+            chunk_size (int): Nombre de lignes lues par bloc
+        """
+        import polars as pl
+
+        start_time = time.time()
+
+        # Lecture des noeuds par blocs
+        nodes_scan = _scan_table(nodes_file, {"id": pl.Int64, "name": pl.String})
+        for batch in nodes_scan.select("id", "name", "lon", "lat").collect_batches(chunk_size=chunk_size):
+            for node_id, name, lon, lat in batch.iter_rows():
+                if node_id is not None:
+                    self.add_node(str(node_id), lat if lat is not None else 0.0,
+                                  lon if lon is not None else 0.0, name or "")
+
+        # Table de correspondance identifiant OSM -> indice de chargement
+        node_ids = list(self.nodes)
+        osm_ids = pl.Series([int(node_id) for node_id in node_ids], dtype=pl.Int64)
+        indices = pl.Series(range(len(node_ids)), dtype=pl.Int64)
+
+        # Lecture des chemins par blocs dans des tableaux extensibles
+        sources, targets, weights = array('q'), array('q'), array('d')
+        ways_scan = _scan_table(ways_file, {"node_from": pl.Int64, "node_to": pl.Int64, "distance_km": pl.Float64})
+        for batch in ways_scan.select("node_from", "node_to", "distance_km").collect_batches(chunk_size=chunk_size):
+            mapped = batch.select(
+                pl.col("node_from").replace_strict(osm_ids, indices, default=None).alias("source"),
+                pl.col("node_to").replace_strict(osm_ids, indices, default=None).alias("target"),
+                pl.col("distance_km").fill_null(0.0),
+            ).drop_nulls(["source", "target"])
+            sources.frombytes(mapped["source"].to_numpy().tobytes())
+            targets.frombytes(mapped["target"].to_numpy().tobytes())
+            weights.frombytes(mapped["distance_km"].to_numpy().tobytes())
+
+        # Construction des listes de voisins (dernière arête lue prioritaire, comme add_edge)
+        nodes = list(self.nodes.values())
+        for source, target, distance in zip(sources, targets, weights):
+            nodes[source].neighbors[node_ids[target]] = distance
+            nodes[target].neighbors[node_ids[source]] = distance
+
+        if largest_component_only:
+            self.prune_to_largest_component()
+        else:
+            self.compute_components()
+
+        end_time = time.time()
+        print(f"Chargement du fichier CSV par blocs avec 'polars' terminé en {end_time - start_time:.2f} s.")
+
+
+def _scan_table(path, schema):
+    """Ouvre un scan paresseux Polars sur un fichier CSV ou Parquet.
+    
+    Args:
+        path (str): Chemin du fichier (.csv ou .parquet)
+        schema (dict): Types imposés aux colonnes lues depuis un CSV
+    """
+    import polars as pl
+
+    if path.endswith(".parquet"):
+        return pl.scan_parquet(path).with_columns(pl.col(column).cast(dtype) for column, dtype in schema.items())
+    return pl.scan_csv(path, schema_overrides=schema)
+
+
+# Méthodes de chargement comparées par les benchmarks {nom: classe}
+LOAD_METHODS = {
+    'CSV Python': GraphCSV,
+    'Pandas': GraphPandas,
+    'Polars': GraphPolars,
+    'Polars (blocs)': GraphStreaming,
+}
+
+# Méthodes capables de lire les fichiers Parquet écrits par osm2csv
+PARQUET_LOAD_METHODS = {
+    'Pandas (Parquet)': GraphPandas,
+    'Polars (Parquet)': GraphPolars,
+    'Polars blocs (Parquet)': GraphStreaming,
+}
+
+
 def test_load_csv_methods(data_name, nodes_file, ways_file):
-    """Teste les trois méthodes de chargement pour un jeu de données.
+    """Teste les quatre méthodes de chargement pour un jeu de données.
     
     Args:
         data_name (str): Nom du jeu de données
@@ -161,6 +262,22 @@ def test_load_csv_methods(data_name, nodes_file, ways_file):
         print(f"❌ Erreur : {str(e)}")
         results['Polars'] = None
     
+    # Test de la méthode par blocs
+    print("\n4. Test de la méthode Polars par blocs")
+    try:
+        start_time = time.time()
+        graph_streaming = GraphStreaming()
+        graph_streaming.load_from_csv(nodes_file, ways_file)
+        streaming_time = time.time() - start_time
+        print(f"✅ Succès - Temps d'exécution : {streaming_time:.3f} secondes")
+        print(f"Nombre de nodes : {len(graph_streaming.nodes)}")
+        total_edges = sum(len(node.neighbors) for node in graph_streaming.nodes.values()) // 2
+        print(f"Nombre d'arêtes : {total_edges}")
+        results['Polars (blocs)'] = streaming_time
+    except Exception as e:
+        print(f"❌ Erreur : {str(e)}")
+        results['Polars (blocs)'] = None
+    
     return results
 
 def main():
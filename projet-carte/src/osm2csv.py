@@ -1,57 +1,321 @@
 import argparse
+import collections
+import contextlib
+import csv
 from osmread import parse_file, Way, Node
 import itertools
 from geopy import distance
 import os
+import time
+import zlib
+from struct import unpack
+from concurrent.futures import ProcessPoolExecutor
+
+NODE_COLUMNS = ["id", "name", "lon", "lat", "highway"]
+WAY_COLUMNS = ["name", "ref", "node_from", "node_to", "highway", "destination", "distance_km"]
+
+# Seules étiquettes utilisées par les fichiers de sortie
+NODE_TAGS = ("name", "highway")
+WAY_TAGS = ("name", "ref", "highway", "destination")
+
+
+def index_blobs(pbf_file):
+    """Liste les blocs de données d'un fichier PBF sans les décompresser.
+    
+    Un fichier PBF est une suite de blocs indépendants (BlobHeader + Blob),
+    ce qui permet de les décoder en parallèle.
+    
+    Args:
+        pbf_file (str): Chemin vers le fichier .pbf
+        
+    Returns:
+        list: Position et taille de chaque bloc OSMData [(offset, datasize)]
+    """
+    from osmread.protobuf.fileformat_pb2 import BlobHeader
+
+    blobs = []
+    with open(pbf_file, "rb") as fp:
+        while True:
+            buf = fp.read(4)
+            if len(buf) < 4:
+                break
+            header = BlobHeader()
+            header.ParseFromString(fp.read(unpack("!L", buf)[0]))
+            if header.type == "OSMData":
+                blobs.append((fp.tell(), header.datasize))
+            fp.seek(header.datasize, os.SEEK_CUR)
+    return blobs
+
+
+def decode_blobs(pbf_file, blobs):
+    """Décode une plage de blocs PBF (exécutée dans un processus de travail).
+    
+    Seuls les nœuds et les chemins 'highway' sont conservés, avec les
+    étiquettes utiles à la conversion. Les relations sont ignorées.
+    
+    Args:
+        pbf_file (str): Chemin vers le fichier .pbf
+        blobs (list): Blocs à décoder [(offset, datasize)]
+        
+    Returns:
+        tuple: (liste des nœuds, liste des chemins, nombre d'entités décodées)
+    """
+    from osmread.protobuf.fileformat_pb2 import Blob
+    from osmread.protobuf.osmformat_pb2 import PrimitiveBlock
+
+    nodes, ways, count = [], [], 0
+    with open(pbf_file, "rb") as fp:
+        for offset, datasize in blobs:
+            fp.seek(offset)
+            blob = Blob()
+            blob.ParseFromString(fp.read(datasize))
+            if len(blob.raw) > 0:
+                data = blob.raw
+            elif len(blob.zlib_data) > 0:
+                data = zlib.decompress(blob.zlib_data)
+            else:
+                raise ValueError("Compression de bloc PBF non supportée")
+            block = PrimitiveBlock()
+            block.ParseFromString(data)
+            strings = [value.decode("utf-8") for value in block.stringtable.s]
+            granularity, lat_offset, lon_offset = block.granularity, block.lat_offset, block.lon_offset
+
+            for group in block.primitivegroup:
+                for e in group.nodes:
+                    tags = {strings[k]: strings[v] for k, v in zip(e.keys, e.vals) if strings[k] in NODE_TAGS}
+                    nodes.append(Node(e.id, 0, 0, 0, 0, tags,
+                                      float(e.lon * granularity + lon_offset) / 1000000000,
+                                      float(e.lat * granularity + lat_offset) / 1000000000))
+                count += len(group.nodes)
+
+                dense = group.dense
+                node_id = lat = lon = 0
+                tag_index = 0
+                keys_vals = dense.keys_vals
+                for delta_id, delta_lat, delta_lon in zip(dense.id, dense.lat, dense.lon):
+                    node_id += delta_id
+                    lat += delta_lat
+                    lon += delta_lon
+                    tags = {}
+                    if tag_index < len(keys_vals):
+                        while keys_vals[tag_index] != 0:
+                            key = strings[keys_vals[tag_index]]
+                            if key in NODE_TAGS:
+                                tags[key] = strings[keys_vals[tag_index + 1]]
+                            tag_index += 2
+                        tag_index += 1
+                    nodes.append(Node(node_id, 0, 0, 0, 0, tags,
+                                      float(lon * granularity + lon_offset) / 1000000000,
+                                      float(lat * granularity + lat_offset) / 1000000000))
+                count += len(dense.id)
+
+                for e in group.ways:
+                    tags = {strings[k]: strings[v] for k, v in zip(e.keys, e.vals)}
+                    if "highway" in tags:
+                        refs = list(itertools.accumulate(e.refs))
+                        ways.append(Way(e.id, 0, 0, 0, 0, {k: tags[k] for k in WAY_TAGS if k in tags}, tuple(refs)))
+                count += len(group.ways) + len(group.relations)
+    return nodes, ways, count
+
+
+def parse_pbf_parallel(pbf_file, workers=None, blobs_per_task=8):
+    """Lit un fichier PBF en décodant ses blocs sur plusieurs processus.
+    
+    Les résultats sont fusionnés dans l'ordre des blocs du fichier : les
+    dictionnaires obtenus sont identiques à ceux d'une lecture séquentielle.
+    
+    Args:
+        pbf_file (str): Chemin vers le fichier .pbf
+        workers (int): Nombre de processus, tous les cœurs par défaut
+        blobs_per_task (int): Nombre de blocs décodés par tâche
+        
+    Returns:
+        tuple: (nœuds {id: Node}, chemins {id: Way}, nombre d'entités décodées)
+    """
+    blobs = index_blobs(pbf_file)
+    tasks = [blobs[i:i + blobs_per_task] for i in range(0, len(blobs), blobs_per_task)]
+
+    nodes, ways, count = {}, {}, 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() rend les résultats dans l'ordre des tâches
+        for task_nodes, task_ways, task_count in executor.map(decode_blobs, itertools.repeat(pbf_file), tasks):
+            for entity in task_nodes:
+                nodes[entity.id] = entity
+            for entity in task_ways:
+                ways[entity.id] = entity
+            count += task_count
+    return nodes, ways, count
+
+
+def iter_node_rows(nodes):
+    """Génère les lignes du fichier des nœuds dans l'ordre de NODE_COLUMNS."""
+    for id, entity in nodes.items():
+        yield entity.id, entity.tags.get("name", ""), entity.lon, entity.lat, entity.tags.get("highway", "")
+
+
+def iter_way_rows(nodes, ways):
+    """Génère les lignes du fichier des chemins dans l'ordre de WAY_COLUMNS."""
+    for id, entity in ways.items():
+        name = entity.tags.get("name", "")
+        ref = entity.tags.get("ref", "")
+        highway = entity.tags.get("highway", "")
+        destination = entity.tags.get("destination", "")
+        combinations = list(itertools.combinations(entity.nodes, 2))
+        for c in combinations:
+            if c[0] in nodes and c[1] in nodes:
+                c_from = (nodes[c[0]].lat, nodes[c[0]].lon)
+                c_to = (nodes[c[1]].lat, nodes[c[1]].lon)
+                dist = distance.distance(c_from, c_to).km
+                yield name, ref, c[0], c[1], highway, destination, dist
+
+
+def _tee_csv(rows, writer):
+    """Écrit chaque ligne au format CSV avant de la transmettre au format suivant."""
+    for row in rows:
+        writer.writerow(row)
+        yield row
+
+
+def _parquet_schemas():
+    """Schémas Parquet typés des nœuds et des chemins (colonnes de NODE_COLUMNS et WAY_COLUMNS).
+
+    Les identifiants sont stockés en int64, les coordonnées et distances
+    en float64, et les colonnes textuelles en catégories (encodage par
+    dictionnaire).
+    """
+    import pyarrow as pa
+
+    category = pa.dictionary(pa.int32(), pa.string())
+    node_schema = pa.schema([("id", pa.int64()), ("name", category), ("lon", pa.float64()),
+                             ("lat", pa.float64()), ("highway", category)])
+    way_schema = pa.schema([("name", category), ("ref", category), ("node_from", pa.int64()),
+                            ("node_to", pa.int64()), ("highway", category), ("destination", category),
+                            ("distance_km", pa.float64())])
+    return node_schema, way_schema
+
+
+def _write_parquet_rows(rows, path, schema, row_group_size):
+    """Écrit des lignes dans un fichier Parquet, un groupe de lignes par lot.
+
+    Seul le lot en cours est conservé en mémoire.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(path, schema) as writer:
+        while True:
+            batch = list(itertools.islice(rows, row_group_size))
+            if not batch:
+                break
+            columns = []
+            for values, field in zip(zip(*batch), schema):
+                if pa.types.is_dictionary(field.type):
+                    columns.append(pa.array(values, pa.string()).dictionary_encode().cast(field.type))
+                else:
+                    columns.append(pa.array(values, field.type))
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema), row_group_size=row_group_size)
+
+
+def write_outputs(nodes, ways, output_dir, formats=("csv",), row_group_size=1_000_000):
+    """Écrit les nœuds et les chemins aux formats demandés (CSV et/ou Parquet).
+
+    Les lignes sont générées une seule fois, même si les deux formats sont
+    demandés : chaque ligne est écrite dans le CSV puis ajoutée au lot
+    Parquet en cours. Le calcul des distances géodésiques, étape la plus
+    coûteuse, n'est donc pas répété, et les fichiers sont écrits au fil de
+    l'eau sans charger toutes les lignes en mémoire.
+
+    Args:
+        nodes (dict): Nœuds OSM {id: Node}
+        ways (dict): Chemins OSM {id: Way}
+        output_dir (str): Dossier de sortie
+        formats (tuple): Formats à écrire ("csv", "parquet")
+        row_group_size (int): Nombre de lignes par groupe de lignes Parquet
+
+    Returns:
+        dict: Chemins des fichiers écrits {format: (nœuds, chemins)}
+    """
+    paths = {}
+    tables = [(NODE_COLUMNS, "osm_nodes", iter_node_rows(nodes)),
+              (WAY_COLUMNS, "osm_ways", iter_way_rows(nodes, ways))]
+    schemas = _parquet_schemas() if "parquet" in formats else (None, None)
+
+    for (columns, name, rows), schema in zip(tables, schemas):
+        with contextlib.ExitStack() as stack:
+            if "csv" in formats:
+                # Le module csv gère l'échappement des noms contenant des virgules ou des guillemets
+                path = os.path.join(output_dir, f"{name}.csv")
+                writer = csv.writer(stack.enter_context(open(path, "w", encoding="utf-8", newline="")))
+                writer.writerow(columns)  # En-têtes
+                rows = _tee_csv(rows, writer)
+                paths.setdefault("csv", []).append(path)
+            if "parquet" in formats:
+                path = os.path.join(output_dir, f"{name}.parquet")
+                _write_parquet_rows(rows, path, schema, row_group_size)
+                paths.setdefault("parquet", []).append(path)
+            else:
+                collections.deque(rows, maxlen=0)  # Consomme les lignes (écriture CSV)
+
+    return {file_format: tuple(files) for file_format, files in paths.items()}
+
+
+def write_csv(nodes, ways, output_dir):
+    """Écrit les nœuds et les chemins au format CSV.
+
+    Returns:
+        tuple: Chemins des fichiers des nœuds et des chemins
+    """
+    return write_outputs(nodes, ways, output_dir, ("csv",))["csv"]
+
+
+def write_parquet(nodes, ways, output_dir, row_group_size=1_000_000):
+    """Écrit les nœuds et les chemins au format Parquet typé.
+
+    Returns:
+        tuple: Chemins des fichiers des nœuds et des chemins
+    """
+    return write_outputs(nodes, ways, output_dir, ("parquet",), row_group_size)["parquet"]
+
 
 def main():
     # Configuration des arguments avec argparse
     parser = argparse.ArgumentParser(description="Traitement des données OSM pour extraire les nœuds et les chemins dans un format intermédiaire.")
     parser.add_argument("pbf_file", type=str, help="Chemin vers le fichier OSM source .pbf.")
-    parser.add_argument("output_dir", type=str, help="Dossier où seront enregistrés les fichiers CSV de sortie.")
+    parser.add_argument("output_dir", type=str, help="Dossier où seront enregistrés les fichiers de sortie.")
+    parser.add_argument("--format", choices=["csv", "parquet", "both"], default="csv",
+                        help="Format des fichiers de sortie (CSV, Parquet typé ou les deux).")
+    parser.add_argument("--row-group-size", type=int, default=1_000_000,
+                        help="Nombre de lignes par groupe de lignes Parquet.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Nombre de processus de décodage du PBF (1 = lecture séquentielle).")
     args = parser.parse_args()
 
     # Création du dossier de sortie s'il n'existe pas
     os.makedirs(args.output_dir, exist_ok=True)
 
-    # Chemins pour les fichiers de sortie
-    output_nodes_path = os.path.join(args.output_dir, "osm_nodes.csv")
-    output_ways_path = os.path.join(args.output_dir, "osm_ways.csv")
-
     nodes = {}
     ways = {}
 
     # Lecture du fichier PBF
-    for entity in parse_file(args.pbf_file):
-        if isinstance(entity, Way) and 'highway' in entity.tags:
-            ways[entity.id] = entity
-        if isinstance(entity, Node):
-            nodes[entity.id] = entity
-
-    # Écriture des nœuds dans le fichier CSV
-    with open(output_nodes_path, "w") as output_nodes:
-        output_nodes.write("id,name,lon,lat,highway\n")  # En-têtes
-        for id, entity in nodes.items():
-            name = entity.tags.get("name", "")
-            highway = entity.tags.get("highway", "")
-            output_nodes.write(f"{entity.id},{name},{entity.lon},{entity.lat},{highway}\n")
-
-    # Écriture des chemins dans le fichier CSV
-    with open(output_ways_path, "w") as output_ways:
-        output_ways.write("name,ref,node_from,node_to,highway,destination,distance_km\n")  # En-têtes
-        for id, entity in ways.items():
-            name = entity.tags.get("name", "")
-            ref = entity.tags.get("ref", "")
-            destination = entity.tags.get("destination", "")
-            combinations = list(itertools.combinations(entity.nodes, 2))
-            for c in combinations:
-                if c[0] in nodes and c[1] in nodes:
-                    c_from = (nodes[c[0]].lat, nodes[c[0]].lon)
-                    c_to = (nodes[c[1]].lat, nodes[c[1]].lon)
-                    dist = distance.distance(c_from, c_to).km
-                    output_ways.write(f'"{name}","{ref}",{c[0]},{c[1]},"{entity.tags.get("highway", "")}","{destination}",{dist}\n')
-
-    print(f"Les fichiers CSV ont été créés dans le dossier : {args.output_dir}")
+    start_time = time.time()
+    if args.workers > 1:
+        nodes, ways, count = parse_pbf_parallel(args.pbf_file, workers=args.workers)
+    else:
+        count = 0
+        for entity in parse_file(args.pbf_file):
+            count += 1
+            if isinstance(entity, Way) and 'highway' in entity.tags:
+                ways[entity.id] = entity
+            if isinstance(entity, Node):
+                nodes[entity.id] = entity
+    elapsed = time.time() - start_time
+    print(f"Lecture du PBF : {count} entités en {elapsed:.2f} s "
+          f"({count / elapsed if elapsed > 0 else 0:.0f} entités/s, {args.workers} processus)")
+
+    formats = ("csv", "parquet") if args.format == "both" else (args.format,)
+    written = write_outputs(nodes, ways, args.output_dir, formats, args.row_group_size)
+    for file_format in written:
+        print(f"Les fichiers {file_format.upper() if file_format == 'csv' else 'Parquet'} ont été créés dans le dossier : {args.output_dir}")
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,22 @@
+import argparse
+import os
 import time
 import io
 import cProfile
 import pstats
+import instrumentation
 from graph import Graph
 from graph_data import GRAPH_DATA
 
-def display_path_results():
-    """Affiche les résultats des chemins pour chaque graphe."""
+def display_path_results(trace_dir=None):
+    """Affiche les résultats des chemins pour chaque graphe.
+    
+    Args:
+        trace_dir (str): Si renseigné, dossier où écrire la trace Chrome
+            (trace.json) et les piles repliées pour flamegraph (trace.folded)
+    """
+    if trace_dir:
+        instrumentation.enable()
     for data in GRAPH_DATA:
         print(f"\n{'='*50}")
         print(f"RÉSULTATS POUR LE GRAPHE DE {data['name'].upper()}")
@@ -72,5 +82,17 @@ def display_path_results():
         except Exception as e:
             print(f"Erreur lors du chargement du graphe de {data['name']}: {str(e)}")
 
+    if trace_dir:
+        tracer = instrumentation.disable()
+        os.makedirs(trace_dir, exist_ok=True)
+        instrumentation.export_chrome_trace(os.path.join(trace_dir, "trace.json"), tracer)
+        instrumentation.export_collapsed(os.path.join(trace_dir, "trace.folded"), tracer)
+        instrumentation.print_summary(tracer)
+        print(f"Traces enregistrées dans le dossier : {trace_dir}")
+
 if __name__ == "__main__":
-    display_path_results()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Affiche les plus courts chemins de chaque graphe.")
+    parser.add_argument("--trace", metavar="DIR", default=None,
+                        help="Enregistre une trace Chrome et des piles repliées (flamegraph) dans DIR.")
+    args = parser.parse_args()
+    display_path_results(args.trace)
\ No newline at end of file
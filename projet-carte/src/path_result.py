@@ -0,0 +1,158 @@
+from array import array
+from itertools import accumulate
+from instrumentation import traced
+
+
+class PathResult:
+    """Résultat d'une recherche de plus court chemin.
+
+    Le chemin est conservé sous forme de tableau d'indices de nœuds : les
+    identifiants OSM, les distances par segment et les distances cumulées
+    ne sont calculés qu'à la première demande.
+
+    Attributs:
+        graph (Graph): Graphe sur lequel le chemin a été calculé
+        indices (array): Indices des nœuds du chemin, du départ vers l'arrivée
+        distance (float): Distance totale en km (inf si aucun chemin)
+        algorithm (str): Algorithme ayant produit le chemin
+        bound (float): Rapport maximal garanti entre distance et la distance
+            optimale (1 = chemin optimal, 1 + epsilon pour A* pondéré)
+    """
+
+    def __init__(self, graph, indices, distance, algorithm="dijkstra", bound=1.0):
+        self.graph = graph
+        self.indices = array('l', indices)
+        self.distance = distance
+        self.algorithm = algorithm
+        self.bound = bound
+        self._segments = None
+        self._cumulative = None
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __bool__(self):
+        return len(self.indices) > 0
+
+    @property
+    def node_ids(self):
+        """Identifiants OSM des nœuds du chemin."""
+        node_ids = self.graph.node_ids
+        return [node_ids[i] for i in self.indices]
+
+    @property
+    def segment_distances(self):
+        """Distance de chaque segment du chemin (km), calculée à la demande."""
+        if self._segments is None:
+            offsets, targets, weights = self.graph.adj_offsets, self.graph.adj_targets, self.graph.adj_weights
+            segments = array('d')
+            for i, j in zip(self.indices, self.indices[1:]):
+                # Recherche de l'arête i -> j dans la liste CSR de i
+                for k in range(offsets[i], offsets[i + 1]):
+                    if targets[k] == j:
+                        segments.append(weights[k])
+                        break
+                else:
+                    segments.append(0.0)
+            self._segments = segments
+        return self._segments
+
+    @property
+    def cumulative_distances(self):
+        """Distance cumulée depuis le départ à chaque nœud du chemin (km)."""
+        if self._cumulative is None:
+            if not self.indices:
+                self._cumulative = array('d')
+            else:
+                self._cumulative = array('d', accumulate(self.segment_distances, initial=0.0))
+        return self._cumulative
+
+    def coordinates(self, expand=False):
+        """Renvoie les coordonnées (latitude, longitude) des nœuds du chemin.
+
+        Args:
+            expand (bool): Inclut les nœuds contractés par Graph.simplify()
+        """
+        # Node et les tableaux du graphe stockent lat/lon inversés (format OSM)
+        if expand and self.graph.edge_geometry:
+            nodes = [self.graph.get_node(node_id) for node_id in self.graph.expand_path(self.node_ids)]
+            return [(node.lon, node.lat) for node in nodes]
+        lat, lon = self.graph.lat, self.graph.lon
+        return [(lon[i], lat[i]) for i in self.indices]
+
+    @traced("serialize:geojson")
+    def to_geojson(self, expand=True):
+        """Convertit le chemin en Feature GeoJSON (LineString).
+
+        Args:
+            expand (bool): Inclut les nœuds contractés par Graph.simplify()
+
+        Returns:
+            dict: Feature GeoJSON, coordonnées au format [longitude, latitude]
+        """
+        return {
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[lon, lat] for lat, lon in self.coordinates(expand)],
+            },
+            "properties": {
+                "algorithm": self.algorithm,
+                "distance_km": self.distance,
+                "bound": self.bound,
+                "from": self.graph.node_ids[self.indices[0]] if self.indices else None,
+                "to": self.graph.node_ids[self.indices[-1]] if self.indices else None,
+            },
+        }
+
+    @traced("serialize:polyline")
+    def to_polyline(self, precision=5, expand=True):
+        """Encode le chemin au format « Encoded Polyline » de Google.
+
+        Args:
+            precision (int): Nombre de décimales conservées (5 = format standard)
+            expand (bool): Inclut les nœuds contractés par Graph.simplify()
+
+        Returns:
+            str: Polyline encodée
+        """
+        factor = 10 ** precision
+        chunks = []
+        previous_lat = previous_lon = 0
+        for lat, lon in self.coordinates(expand):
+            lat, lon = round(lat * factor), round(lon * factor)
+            for delta in (lat - previous_lat, lon - previous_lon):
+                value = ~(delta << 1) if delta < 0 else delta << 1
+                while value >= 0x20:
+                    chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+                    value >>= 5
+                chunks.append(chr(value + 63))
+            previous_lat, previous_lon = lat, lon
+        return "".join(chunks)
+
+    def print(self):
+        """Affiche le chemin avec la distance cumulée à chaque étape."""
+        nodes = self.graph.nodes
+        cumulative = self.cumulative_distances
+        for i, node_id in enumerate(self.node_ids):
+            node = nodes[node_id]
+            if i == 0:
+                print(f"{i} - From: ['{node_id}', '{node.name or 'None'}', '{node.lat}', '{node.lon}']")
+            else:
+                print(f"{i} - To: ['{node_id}', '{node.name or 'None'}', '{node.lat}', '{node.lon}']: distance = {cumulative[i]:.3f} km")
+
+
+def to_feature_collection(results, expand=True):
+    """Regroupe plusieurs chemins dans une FeatureCollection GeoJSON.
+
+    Args:
+        results (list): Liste de PathResult
+        expand (bool): Inclut les nœuds contractés par Graph.simplify()
+
+    Returns:
+        dict: FeatureCollection GeoJSON
+    """
+    return {
+        "type": "FeatureCollection",
+        "features": [result.to_geojson(expand) for result in results if result],
+    }
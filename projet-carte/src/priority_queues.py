@@ -0,0 +1,210 @@
+from heapq import heappush, heappop
+
+
+class HeapQueue:
+    """File de priorité binaire basée sur heapq, avec suppression paresseuse.
+
+    Une amélioration de priorité ajoute une nouvelle entrée sans retirer
+    l'ancienne : l'algorithme de recherche ignore les entrées périmées.
+    C'est le comportement historique de Graph.dijkstra et Graph.a_star.
+
+    Attributs:
+        pushes (int): Nombre d'insertions
+        pops (int): Nombre d'extractions
+        decreases (int): Nombre de diminutions de clé (toujours 0 ici)
+        max_size (int): Taille maximale atteinte par la file
+    """
+    name = "heapq"
+
+    def __init__(self):
+        self.heap = []
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, priority, item):
+        heappush(self.heap, (priority, item))
+        self.pushes += 1
+        if len(self.heap) > self.max_size:
+            self.max_size = len(self.heap)
+
+    def pop(self):
+        self.pops += 1
+        return heappop(self.heap)
+
+
+class IndexedHeap:
+    """Tas binaire indexé avec diminution de clé (decrease-key).
+
+    Chaque indice de nœud est présent au plus une fois : la position de
+    chaque élément dans le tas est conservée pour pouvoir le remonter
+    lorsque sa priorité diminue. La file ne contient donc jamais de doublons.
+
+    Attributs:
+        pushes (int): Nombre d'insertions
+        pops (int): Nombre d'extractions
+        decreases (int): Nombre de diminutions de clé
+        max_size (int): Taille maximale atteinte par la file
+    """
+    name = "indexed"
+
+    def __init__(self):
+        self.priorities = []
+        self.items = []
+        self.positions = {}  # {indice de nœud: position dans le tas}
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, priority, item):
+        position = self.positions.get(item)
+        if position is None:
+            position = len(self.items)
+            self.priorities.append(priority)
+            self.items.append(item)
+            self.pushes += 1
+            if len(self.items) > self.max_size:
+                self.max_size = len(self.items)
+        elif priority < self.priorities[position]:
+            self.decreases += 1
+        else:
+            return
+        self._sift_up(position, priority, item)
+
+    def pop(self):
+        self.pops += 1
+        priorities, items = self.priorities, self.items
+        priority, item = priorities[0], items[0]
+        del self.positions[item]
+        last_priority, last_item = priorities.pop(), items.pop()
+        if items:
+            self._sift_down(last_priority, last_item)
+        return priority, item
+
+    def _sift_up(self, position, priority, item):
+        priorities, items, positions = self.priorities, self.items, self.positions
+        while position > 0:
+            parent = (position - 1) >> 1
+            if priorities[parent] <= priority:
+                break
+            priorities[position] = priorities[parent]
+            items[position] = items[parent]
+            positions[items[position]] = position
+            position = parent
+        priorities[position] = priority
+        items[position] = item
+        positions[item] = position
+
+    def _sift_down(self, priority, item):
+        priorities, items, positions = self.priorities, self.items, self.positions
+        size = len(items)
+        position = 0
+        child = 1
+        while child < size:
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priority <= priorities[child]:
+                break
+            priorities[position] = priorities[child]
+            items[position] = items[child]
+            positions[items[position]] = position
+            position = child
+            child = 2 * position + 1
+        priorities[position] = priority
+        items[position] = item
+        positions[item] = position
+
+
+class BucketQueue:
+    """File à seaux (algorithme de Dial) sur des priorités mises à l'échelle entière.
+
+    Les priorités sont réparties dans des seaux de largeur `resolution`
+    (1 m par défaut pour des distances en km). Chaque seau est un petit
+    tas, ce qui conserve l'ordre exact à l'intérieur d'un seau : les
+    distances obtenues sont identiques à celles de heapq. Comme HeapQueue,
+    la file utilise la suppression paresseuse.
+
+    Attributs:
+        resolution (float): Largeur d'un seau, dans l'unité des distances
+        pushes (int): Nombre d'insertions
+        pops (int): Nombre d'extractions
+        decreases (int): Nombre de diminutions de clé (toujours 0 ici)
+        max_size (int): Taille maximale atteinte par la file
+    """
+    name = "bucket"
+
+    def __init__(self, resolution=0.001):
+        self.resolution = resolution
+        self.buckets = {}  # {clé entière: tas de (priorité, élément)}
+        self.cursor = None  # Plus petite clé potentiellement non vide
+        self.size = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+        self.max_size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, priority, item):
+        key = int(priority / self.resolution)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = []
+        heappush(bucket, (priority, item))
+        # Une heuristique non monotone peut insérer sous le curseur
+        if self.cursor is None or key < self.cursor:
+            self.cursor = key
+        self.size += 1
+        self.pushes += 1
+        if self.size > self.max_size:
+            self.max_size = self.size
+
+    def pop(self):
+        self.pops += 1
+        buckets = self.buckets
+        while self.cursor not in buckets:
+            self.cursor += 1
+        bucket = buckets[self.cursor]
+        entry = heappop(bucket)
+        if not bucket:
+            del buckets[self.cursor]
+        self.size -= 1
+        return entry
+
+
+# Files disponibles pour Graph.dijkstra et Graph.a_star
+QUEUES = {queue.name: queue for queue in (HeapQueue, IndexedHeap, BucketQueue)}
+
+
+def make_queue(name="heapq"):
+    """Crée une file de priorité à partir de son nom.
+
+    Args:
+        name (str): "heapq", "indexed" ou "bucket"
+
+    Returns:
+        File de priorité vide
+    """
+    if name not in QUEUES:
+        raise ValueError(f"File de priorité inconnue : {name} (attendu : {', '.join(QUEUES)})")
+    return QUEUES[name]()
+
+
+def queue_stats(queue):
+    """Renvoie les compteurs d'opérations d'une file sous forme de dictionnaire."""
+    return {
+        'queue': queue.name,
+        'pushes': queue.pushes,
+        'pops': queue.pops,
+        'decreases': queue.decreases,
+        'max_size': queue.max_size,
+    }
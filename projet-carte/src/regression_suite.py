@@ -0,0 +1,395 @@
+"""
+Suite de non-régression des performances.
+
+Mesure, pour chaque jeu de données, le chargement des CSV, la construction
+des index, l'ouverture d'un instantané, les requêtes point à point (Dijkstra
+et A*), les requêtes un-vers-plusieurs (isochrones) et l'empreinte mémoire,
+ainsi que le temps d'import des points d'entrée (démarrage à froid).
+
+Les résultats sont comparés à une référence JSON propre à la machine
+(benchmarks/baselines/<machine>.json) : la commande échoue avec un rapport
+lorsqu'une mesure dépasse la référence de plus du seuil de tolérance.
+
+Les jeux de GRAPH_DATA sont utilisés lorsque leurs fichiers sont présents ;
+un graphe synthétique (grille routière pseudo-aléatoire) est généré pour
+pouvoir tourner hors ligne, sans données OSM.
+
+Utilisation :
+    python regression_suite.py                 # compare à la référence
+    python regression_suite.py --update        # enregistre une nouvelle référence
+    python regression_suite.py --threshold 0.3 --datasets synthetic
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from graph import Graph
+from graph_data import GRAPH_DATA
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baselines")
+SYNTHETIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "synthetic")
+
+# Mesures suivies : {nom: (unité, description)} ; plus petit = meilleur
+METRICS = {
+    "load_s": ("s", "Chargement des CSV"),
+    "index_s": ("s", "Construction des tableaux CSR"),
+    "snapshot_open_s": ("s", "Ouverture de l'instantané"),
+    "route_dijkstra_s": ("s", "Requêtes point à point (Dijkstra)"),
+    "route_a_star_s": ("s", "Requêtes point à point (A*)"),
+    "one_to_many_s": ("s", "Requêtes un-vers-plusieurs (isochrones)"),
+    "memory_mb": ("MB", "Pic mémoire Python du chargement"),
+    "snapshot_mb": ("MB", "Taille de l'instantané"),
+    "import_graph_s": ("s", "Import de graph (démarrage à froid)"),
+    "import_benchmark_s": ("s", "Import de benchmark (démarrage à froid)"),
+}
+
+# Points d'entrée dont le temps d'import est mesuré
+IMPORT_MODULES = ("graph", "benchmark")
+
+# En dessous de ces écarts absolus, une variation n'est pas une régression
+# (bruit de mesure sur les temps très courts)
+ABSOLUTE_TOLERANCE = {"s": 0.005, "MB": 0.5}
+
+
+def machine_tag():
+    """Renvoie l'identifiant de la machine utilisé pour nommer la référence."""
+    tag = f"{platform.node() or 'machine'}-{platform.machine()}-py{sys.version_info[0]}{sys.version_info[1]}"
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in tag)
+
+
+def machine_info():
+    """Décrit la machine et l'environnement ayant produit les mesures."""
+    return {
+        "tag": machine_tag(),
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "system": f"{platform.system()} {platform.release()}",
+        "python": platform.python_version(),
+    }
+
+
+def _haversine_km(point1, point2):
+    """Distance à vol d'oiseau en km entre deux points (lat, lon) en degrés."""
+    lat1, lon1 = math.radians(point1[0]), math.radians(point1[1])
+    lat2, lon2 = math.radians(point2[0]), math.radians(point2[1])
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 6371.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def generate_synthetic_graph(output_dir, size=120, seed=42):
+    """Génère un réseau routier synthétique au format de osm2csv.
+
+    Le réseau est une grille de size x size carrefours, légèrement déformée,
+    dont une partie des tronçons est absente et dont certains tronçons
+    passent par des nœuds de forme. Le résultat ne dépend que de size et seed.
+
+    Args:
+        output_dir (str): Dossier où écrire osm_nodes.csv et osm_ways.csv
+        size (int): Nombre de carrefours par côté
+        seed (int): Graine du générateur pseudo-aléatoire
+
+    Returns:
+        tuple: Chemins des fichiers des nœuds et des chemins
+    """
+    import csv
+
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    nodes = {}  # {id: (lat, lon)}
+
+    def add_node(lat, lon):
+        node_id = 1_000_000 + len(nodes)
+        nodes[node_id] = (lat, lon)
+        return node_id
+
+    grid = [[add_node(42.9 + i * 0.002 + rng.uniform(-3e-4, 3e-4), 1.5 + j * 0.002 + rng.uniform(-3e-4, 3e-4))
+             for j in range(size)] for i in range(size)]
+    edges = []
+    for i in range(size):
+        for j in range(size):
+            for di, dj in ((1, 0), (0, 1)):
+                if i + di < size and j + dj < size and rng.random() < 0.85:
+                    previous, target = grid[i][j], grid[i + di][j + dj]
+                    (lat1, lon1), (lat2, lon2) = nodes[previous], nodes[target]
+                    shape_points = rng.randint(0, 2)
+                    for k in range(1, shape_points + 1):
+                        t = k / (shape_points + 1)
+                        shape = add_node(lat1 + (lat2 - lat1) * t + 1e-4, lon1 + (lon2 - lon1) * t)
+                        edges.append((previous, shape))
+                        previous = shape
+                    edges.append((previous, target))
+
+    nodes_file = os.path.join(output_dir, "osm_nodes.csv")
+    ways_file = os.path.join(output_dir, "osm_ways.csv")
+    with open(nodes_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "lon", "lat", "highway"])
+        writer.writerows((node_id, "", lon, lat, "") for node_id, (lat, lon) in nodes.items())
+    with open(ways_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "ref", "node_from", "node_to", "highway", "destination", "distance_km"])
+        writer.writerows(("", "", a, b, "residential", "", _haversine_km(nodes[a], nodes[b]))
+                         for a, b in edges)
+    return nodes_file, ways_file
+
+
+def datasets(selection="all"):
+    """Liste les jeux de données disponibles pour la suite.
+
+    Args:
+        selection (str): "bundled" (GRAPH_DATA), "synthetic" ou "all"
+
+    Returns:
+        list: [{'name', 'nodes', 'ways'}]
+    """
+    selected = []
+    if selection in ("bundled", "all"):
+        for data in GRAPH_DATA:
+            if os.path.exists(data['nodes']) and os.path.exists(data['ways']):
+                selected.append({'name': data['name'], 'nodes': data['nodes'], 'ways': data['ways']})
+            else:
+                print(f"[INFO] ⏭️  {data['name']} : fichiers absents, jeu ignoré")
+    if selection in ("synthetic", "all"):
+        nodes_file = os.path.join(SYNTHETIC_DIR, "osm_nodes.csv")
+        ways_file = os.path.join(SYNTHETIC_DIR, "osm_ways.csv")
+        if not (os.path.exists(nodes_file) and os.path.exists(ways_file)):
+            print("[INFO] 🧪 Génération du graphe synthétique...")
+            generate_synthetic_graph(SYNTHETIC_DIR)
+        selected.append({'name': "synthetic", 'nodes': nodes_file, 'ways': ways_file})
+    return selected
+
+
+def sample_pairs(graph, count=20, seed=0):
+    """Tire des couples (départ, arrivée) dans la plus grande composante.
+
+    Le tirage porte sur les identifiants triés : il est identique d'une
+    exécution à l'autre pour un même jeu de données.
+    """
+    rng = random.Random(seed)
+    candidates = sorted(graph.node_ids[i] for i in range(len(graph.node_ids)) if graph.components[i] == 0)
+    return [(rng.choice(candidates), rng.choice(candidates)) for _ in range(count)]
+
+
+def _best_time(function, runs):
+    """Renvoie le meilleur temps sur plusieurs exécutions (le moins bruité)."""
+    best = float('inf')
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def measure_dataset(dataset, runs=3, pairs=20, budgets=(1, 5, 10)):
+    """Mesure toutes les métriques de METRICS sur un jeu de données.
+
+    Args:
+        dataset (dict): Jeu de données {'name', 'nodes', 'ways'}
+        runs (int): Nombre d'exécutions par mesure (le meilleur temps est gardé)
+        pairs (int): Nombre de requêtes point à point par exécution
+        budgets (tuple): Distances des isochrones (km)
+
+    Returns:
+        dict: {métrique: valeur}
+    """
+    metrics = {}
+    graphs = []
+
+    def load():
+        graph = Graph()
+        graph.load_from_csv(dataset['nodes'], dataset['ways'])
+        graphs.append(graph)
+    metrics["load_s"] = _best_time(load, runs)
+    graph = graphs[-1]
+    del graphs[:-1]
+    metrics["index_s"] = _best_time(lambda: graph.build_arrays(), runs)
+
+    # Mémoire allouée par le chargement complet (CSV + tableaux)
+    tracemalloc.start()
+    memory_graph = Graph()
+    memory_graph.load_from_csv(dataset['nodes'], dataset['ways'])
+    memory_graph.build_arrays()
+    metrics["memory_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    del memory_graph
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = os.path.join(tmp, "graph.snapshot")
+        graph.save_snapshot(snapshot)
+        metrics["snapshot_mb"] = os.path.getsize(snapshot) / (1024 * 1024)
+        metrics["snapshot_open_s"] = _best_time(lambda: Graph.load_snapshot(snapshot), runs)
+
+    queries = sample_pairs(graph, pairs)
+    metrics["route_dijkstra_s"] = _best_time(lambda: [graph.dijkstra(s, e) for s, e in queries], runs)
+    metrics["route_a_star_s"] = _best_time(lambda: [graph.a_star(s, e) for s, e in queries], runs)
+    sources = [start for start, _ in queries[:5]]
+    metrics["one_to_many_s"] = _best_time(lambda: [graph.isochrones(s, budgets) for s in sources], runs)
+    return metrics
+
+
+def measure_imports(modules=IMPORT_MODULES, runs=3):
+    """Mesure le temps d'import de modules dans un interpréteur neuf.
+
+    Chaque mesure lance `python -X importtime -c "import module"` et lit le
+    temps cumulé du module, dépendances comprises.
+
+    Args:
+        modules (tuple): Modules mesurés
+        runs (int): Nombre de lancements par module (le meilleur temps est gardé)
+
+    Returns:
+        dict: {'import_<module>_s': secondes}
+    """
+    import subprocess
+
+    metrics = {}
+    for module in modules:
+        best = float('inf')
+        for _ in range(runs):
+            completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       capture_output=True, text=True, check=True)
+            # Lignes « import time: propre | cumulé | nom », en microsecondes
+            for line in completed.stderr.splitlines():
+                fields = line.split("|")
+                if len(fields) == 3 and fields[2].strip() == module and not fields[2].startswith("  "):
+                    best = min(best, int(fields[1]) / 1e6)
+        metrics[f"import_{module}_s"] = best
+    return metrics
+
+
+def compare(current, baseline, threshold=0.2):
+    """Compare des mesures à une référence.
+
+    Une mesure régresse si elle dépasse la référence de plus de `threshold`
+    (en proportion) et d'un écart absolu supérieur à ABSOLUTE_TOLERANCE.
+
+    Args:
+        current (dict): {jeu: {métrique: valeur}}
+        baseline (dict): {jeu: {métrique: valeur}}
+        threshold (float): Dégradation relative tolérée (0.2 = +20 %)
+
+    Returns:
+        list: Lignes de comparaison (jeu, métrique, référence, actuel, écart, régression)
+    """
+    rows = []
+    for name, metrics in current.items():
+        reference = baseline.get(name, {})
+        for metric, value in metrics.items():
+            if metric not in reference:
+                continue
+            unit = METRICS[metric][0]
+            base = reference[metric]
+            change = (value - base) / base if base > 0 else 0.0
+            regressed = change > threshold and value - base > ABSOLUTE_TOLERANCE[unit]
+            rows.append((name, metric, base, value, change, regressed))
+    return rows
+
+
+def print_report(rows, threshold):
+    """Affiche le tableau de comparaison et le détail des régressions."""
+    print("\n" + "="*80)
+    print(f" 📊 COMPARAISON À LA RÉFÉRENCE (seuil : +{threshold * 100:.0f} %)")
+    print("="*80)
+    print(f"{'Jeu':<18} {'Mesure':<20} {'Référence':>12} {'Actuel':>12} {'Écart':>9}")
+    for name, metric, base, value, change, regressed in rows:
+        flag = "❌" if regressed else "✅"
+        print(f"{name:<18} {metric:<20} {base:>12.4f} {value:>12.4f} {change * 100:>+8.1f}% {flag}")
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) détectée(s) :")
+        for name, metric, base, value, change, _ in regressions:
+            unit, description = METRICS[metric]
+            print(f"  - {name} / {description} : {base:.4f} {unit} → {value:.4f} {unit} ({change * 100:+.1f} %)")
+    else:
+        print("\n✅ Aucune régression")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, runs):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {
+        "machine": machine_info(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "runs": runs,
+        "datasets": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+
+
+def run_suite(selection="all", threshold=0.2, runs=3, update=False, baseline_path=None):
+    """Exécute la suite et la compare à la référence de la machine.
+
+    Sans référence existante (ou avec update=True), les mesures deviennent
+    la nouvelle référence.
+
+    Args:
+        selection (str): Jeux de données, voir datasets()
+        threshold (float): Dégradation relative tolérée
+        runs (int): Nombre d'exécutions par mesure
+        update (bool): Remplace la référence par les mesures courantes
+        baseline_path (str): Fichier de référence (par défaut, celui de la machine)
+
+    Returns:
+        bool: True si aucune mesure n'a régressé
+    """
+    baseline_path = baseline_path or os.path.join(BASELINE_DIR, f"{machine_tag()}.json")
+    results = {"imports": measure_imports(runs=runs)}
+    for metric, value in results["imports"].items():
+        print(f"  {METRICS[metric][1]:<42}: {value:.4f} {METRICS[metric][0]}")
+    for dataset in datasets(selection):
+        print(f"\n[INFO] ⏱️  Mesures sur {dataset['name']}...")
+        results[dataset['name']] = measure_dataset(dataset, runs=runs)
+        for metric, value in results[dataset['name']].items():
+            print(f"  {METRICS[metric][1]:<42}: {value:.4f} {METRICS[metric][0]}")
+
+    baseline = load_baseline(baseline_path)
+    if update or baseline is None:
+        save_baseline(baseline_path, results, runs)
+        print(f"\n[INFO] 💾 Référence enregistrée : {baseline_path}")
+        return True
+
+    rows = compare(results, baseline["datasets"], threshold)
+    print_report(rows, threshold)
+    return not any(row[5] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de non-régression des performances du calcul d'itinéraires.")
+    parser.add_argument("--datasets", choices=["bundled", "synthetic", "all"], default="all",
+                        help="Jeux de données mesurés.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Dégradation relative tolérée avant échec (0.2 = +20 %%).")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Nombre d'exécutions par mesure (le meilleur temps est gardé).")
+    parser.add_argument("--update", action="store_true",
+                        help="Enregistre les mesures comme nouvelle référence.")
+    parser.add_argument("--baseline", default=None,
+                        help="Fichier de référence (par défaut benchmarks/baselines/<machine>.json).")
+    args = parser.parse_args()
+    ok = run_suite(args.datasets, args.threshold, args.runs, args.update, args.baseline)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()